@@ -2,33 +2,53 @@
 File to run application.
 """
 
+import atexit
 import logging
 import os
+import queue
 import sys
 import traceback
-from PyQt5.QtCore import pyqtSignal, QObject
+from logging.handlers import QueueHandler, QueueListener
+from PyQt5.QtCore import pyqtSignal, QObject, QTimer
 from PyQt5.QtWidgets import QApplication, QMessageBox
-from src.main_window import MainWindow
-from src.utils import get_dir_name
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+def attach_file_handler():
+    """
+    Function adds handler to write logs to file. It is called after main window
+    was shown.
+    """
+
+    from src.utils import get_dir_name
+
+    file_name = os.path.join(get_dir_name(), "logs.log")
+    # File is opened on first record in thread of listener, so GUI thread does not wait for disk
+    file_handler = logging.FileHandler(file_name, delay=True)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    file_handler.setLevel(logging.INFO)
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setLevel(logging.INFO)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    logging.getLogger("pyvac_test").addHandler(queue_handler)
 
 
 def create_logger() -> logging.Logger:
     """
-    Function creates logger for application.
+    Function creates logger for application. Logger writes to console only, handler
+    for log file is added later by function attach_file_handler.
     :return: logger.
     """
 
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
     stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(formatter)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
     stream_handler.setLevel(logging.INFO)
-    file_name = os.path.join(get_dir_name(), "logs.log")
-    file_handler = logging.FileHandler(file_name)
-    file_handler.setFormatter(formatter)
-    file_handler.setLevel(logging.INFO)
     logger = logging.getLogger("pyvac_test")
     logger.addHandler(stream_handler)
-    logger.addHandler(file_handler)
     logger.setLevel(logging.INFO)
     logger.propagate = False
     return logger
@@ -75,11 +95,15 @@ class ExceptionHandler(QObject):
 
 if __name__ == "__main__":
 
-    create_logger()
     app = QApplication(sys.argv)
+    create_logger()
     exceprion_handler = ExceptionHandler()
     sys.excepthook = exceprion_handler.exception_hook
     exceprion_handler.exception_raised.connect(show_exception)
+    # Main window pulls in camera SDK, numpy and widgets, so it is imported only
+    # after application is created
+    from src.main_window import MainWindow
     main_window = MainWindow()
     main_window.show()
+    QTimer.singleShot(0, attach_file_handler)
     app.exec()
@@ -8,6 +8,7 @@ python -m venv venv
 venv\Scripts\python -m pip install --upgrade pip
 venv\Scripts\python -m pip install -r requirements.txt
 venv\Scripts\python -m pip install pyinstaller
+venv\Scripts\pyuic5 gui\main_window.ui -o src\ui_main_window.py
 
 venv\Scripts\pyinstaller main.py --clean --onefile ^
 --add-data "gui\*;gui" ^
@@ -8,6 +8,7 @@ python3 -m venv venv
 ./venv/bin/python3 -m pip install --upgrade pip
 ./venv/bin/python3 -m pip install -r requirements.txt
 ./venv/bin/python3 -m pip install pyinstaller
+./venv/bin/pyuic5 gui/main_window.ui -o src/ui_main_window.py
 
 ./venv/bin/pyinstaller main.py --clean --onefile --noconsole \
 --add-data "./gui/*:gui" \
@@ -2,9 +2,13 @@
 File with parameters of camera.
 """
 
-from typing import Optional, Union
+import collections
+import functools
+from typing import Optional, TYPE_CHECKING, Union
 from enum import auto, Enum
-from vac248ip import Vac248IpGamma, Vac248IpShutter, Vac248IpVideoFormat
+
+if TYPE_CHECKING:
+    from vac248ip import Vac248IpGamma, Vac248IpShutter, Vac248IpVideoFormat
 
 
 class CameraParameters(Enum):
@@ -28,12 +32,11 @@ class CameraParameters(Enum):
         :return: names of all parameters.
         """
 
-        return (cls.CONTRAST, cls.EXPOSURE, cls.GAIN_ANALOG, cls.GAIN_DIGITAL, cls.GAMMA,
-                cls.MAX_GAIN_AUTO, cls.SHUTTER, cls.VIDEO_FORMAT)
+        return _ALL_PARAMETERS
 
     @classmethod
     def get_value(cls, param: "CameraParameters", value: int) ->\
-            Optional[Union[int, Vac248IpGamma, Vac248IpShutter, Vac248IpVideoFormat]]:
+            Optional[Union[int, "Vac248IpGamma", "Vac248IpShutter", "Vac248IpVideoFormat"]]:
         """
         Method converts value of parameter.
         :param param: parameter;
@@ -41,22 +44,25 @@ class CameraParameters(Enum):
         :return: converted value.
         """
 
-        if param not in cls.get_all_parameters():
-            return None
         try:
-            if param == CameraParameters.GAMMA:
-                return Vac248IpGamma(value)
-            if param == CameraParameters.SHUTTER:
-                return Vac248IpShutter(value)
-            if param == CameraParameters.VIDEO_FORMAT:
-                return Vac248IpVideoFormat(value)
+            spec = _PARAM_TABLE[param]
+        except KeyError:
+            # Table is filled when camera SDK is imported for the first time
+            if _PARAM_TABLE or param not in _ALL_PARAMETERS_SET:
+                return None
+            _get_sdk_attributes()
+            spec = _PARAM_TABLE[param]
+        try:
+            if spec.values is not None:
+                # Type of default value is enumeration of parameter values
+                return type(spec.default)(value)
             value = int(value)
         except ValueError:
-            return CAMERA_PARAMETERS[param][DEFAULT]
-        if value < CAMERA_PARAMETERS[param][MIN]:
-            return CAMERA_PARAMETERS[param][MIN]
-        if value > CAMERA_PARAMETERS[param][MAX]:
-            return CAMERA_PARAMETERS[param][MAX]
+            return spec.default
+        if value < spec.minv:
+            return spec.minv
+        if value > spec.maxv:
+            return spec.maxv
         return value
 
     @classmethod
@@ -67,11 +73,14 @@ class CameraParameters(Enum):
         :return: True if auto mode is required.
         """
 
-        if parameter in (cls.CONTRAST, cls.GAMMA, cls.MAX_GAIN_AUTO):
-            return True
-        return False
+        return parameter in _AUTO_REQUIRED
 
 
+# Order of parameters is the same as order of attributes in class
+_ALL_PARAMETERS = tuple(CameraParameters)
+_ALL_PARAMETERS_SET = frozenset(_ALL_PARAMETERS)
+_AUTO_REQUIRED = frozenset((CameraParameters.CONTRAST, CameraParameters.GAMMA, CameraParameters.MAX_GAIN_AUTO))
+
 DEFAULT = "default"
 GET = "get"
 MAX = "max"
@@ -81,6 +90,7 @@ SET = "set"
 TEST_ERROR = "test_error"
 TEST_FRAME = "test_frame"
 TEST_FRAME_GOOD = "test_frame_good"
+TEST_IMAGE = "test_image"
 TEST_RESULT = "test_result"
 VALUE = "value"
 VALUES = "values"
@@ -97,54 +107,92 @@ GAIN_ANALOG_MIN = 1
 GAIN_DIGITAL_DEFAULT = 4
 GAIN_DIGITAL_MAX = 48
 GAIN_DIGITAL_MIN = 1
-GAMMA_DEFAULT = Vac248IpGamma.GAMMA_1
 MAX_GAIN_AUTO_DEFAULT = 10
 MAX_GAIN_AUTO_MAX = 10
 MAX_GAIN_AUTO_MIN = 1
-SHUTTER_DEFAULT = Vac248IpShutter.SHUTTER_ROLLING
-VIDEO_FORMAT = Vac248IpVideoFormat.FORMAT_960x600
-
-CAMERA_PARAMETERS = {
-    CameraParameters.CONTRAST: {DEFAULT: CONTRAST_DEFAULT,
-                                MAX: CONTRAST_MAX,
-                                MIN: CONTRAST_MIN,
-                                GET: "get_contrast_auto",
-                                SET: "set_contrast_auto"},
-    CameraParameters.EXPOSURE: {DEFAULT: EXPOSURE_DEFAULT,
-                                MAX: EXPOSURE_MAX,
-                                MIN: EXPOSURE_MIN,
-                                GET: "get_exposure",
-                                SET: "set_exposure"},
-    CameraParameters.GAIN_ANALOG: {DEFAULT: GAIN_ANALOG_DEFAULT,
-                                   MAX: GAIN_ANALOG_MAX,
-                                   MIN: GAIN_ANALOG_MIN,
-                                   GET: "get_gain_analog",
-                                   SET: "set_gain_analog"},
-    CameraParameters.GAIN_DIGITAL: {DEFAULT: GAIN_DIGITAL_DEFAULT,
-                                    MAX: GAIN_DIGITAL_MAX,
-                                    MIN: GAIN_DIGITAL_MIN,
-                                    GET: "get_gain_digital",
-                                    SET: "set_gain_digital"},
-    CameraParameters.GAMMA: {DEFAULT: GAMMA_DEFAULT,
-                             VALUES: (Vac248IpGamma.GAMMA_045, Vac248IpGamma.GAMMA_07,
-                                      Vac248IpGamma.GAMMA_1),
-                             GET: "get_gamma",
-                             SET: "set_gamma"},
-    CameraParameters.MAX_GAIN_AUTO: {DEFAULT: MAX_GAIN_AUTO_DEFAULT,
-                                     MAX: MAX_GAIN_AUTO_MAX,
-                                     MIN: MAX_GAIN_AUTO_MIN,
-                                     GET: "get_max_gain_auto",
-                                     SET: "set_max_gain_auto"},
-    CameraParameters.SHUTTER: {DEFAULT: SHUTTER_DEFAULT,
-                               VALUES: (Vac248IpShutter.SHUTTER_GLOBAL,
-                                        Vac248IpShutter.SHUTTER_ROLLING),
-                               GET: "get_shutter",
-                               SET: "set_shutter"},
-    CameraParameters.VIDEO_FORMAT: {DEFAULT: VIDEO_FORMAT,
-                                    VALUES: (Vac248IpVideoFormat.FORMAT_960x600,
-                                             Vac248IpVideoFormat.FORMAT_1920x1200),
-                                    GET: "get_video_format",
-                                    SET: "set_video_format"}
-}
 
 CONFIG_FILE = "config.ini"
+
+# Specification of camera parameter. For parameters with enumerated values minv and
+# maxv are None, for numeric parameters values is None
+ParamSpec = collections.namedtuple("ParamSpec", "default minv maxv values getter setter")
+
+# Names that require camera SDK, they are created on first access
+_SDK_ATTRIBUTES = ("CAMERA_PARAMETERS", "GAMMA_DEFAULT", "PARAM_TABLE", "SHUTTER_DEFAULT", "VIDEO_FORMAT",
+                   "Vac248IpGamma", "Vac248IpShutter", "Vac248IpVideoFormat")
+# Specifications of camera parameters, table is filled together with attributes
+# that require camera SDK
+_PARAM_TABLE: dict = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_sdk_attributes() -> dict:
+    """
+    Function imports camera SDK and creates attributes of module that depend on it.
+    :return: dictionary with attributes.
+    """
+
+    from vac248ip import Vac248IpGamma, Vac248IpShutter, Vac248IpVideoFormat
+
+    gamma_default = Vac248IpGamma.GAMMA_1
+    shutter_default = Vac248IpShutter.SHUTTER_ROLLING
+    video_format = Vac248IpVideoFormat.FORMAT_960x600
+    param_table = {
+        CameraParameters.CONTRAST: ParamSpec(CONTRAST_DEFAULT, CONTRAST_MIN, CONTRAST_MAX, None,
+                                             "get_contrast_auto", "set_contrast_auto"),
+        CameraParameters.EXPOSURE: ParamSpec(EXPOSURE_DEFAULT, EXPOSURE_MIN, EXPOSURE_MAX, None,
+                                             "get_exposure", "set_exposure"),
+        CameraParameters.GAIN_ANALOG: ParamSpec(GAIN_ANALOG_DEFAULT, GAIN_ANALOG_MIN, GAIN_ANALOG_MAX, None,
+                                                "get_gain_analog", "set_gain_analog"),
+        CameraParameters.GAIN_DIGITAL: ParamSpec(GAIN_DIGITAL_DEFAULT, GAIN_DIGITAL_MIN, GAIN_DIGITAL_MAX, None,
+                                                 "get_gain_digital", "set_gain_digital"),
+        CameraParameters.GAMMA: ParamSpec(gamma_default, None, None,
+                                          (Vac248IpGamma.GAMMA_045, Vac248IpGamma.GAMMA_07,
+                                           Vac248IpGamma.GAMMA_1),
+                                          "get_gamma", "set_gamma"),
+        CameraParameters.MAX_GAIN_AUTO: ParamSpec(MAX_GAIN_AUTO_DEFAULT, MAX_GAIN_AUTO_MIN, MAX_GAIN_AUTO_MAX, None,
+                                                  "get_max_gain_auto", "set_max_gain_auto"),
+        CameraParameters.SHUTTER: ParamSpec(shutter_default, None, None,
+                                            (Vac248IpShutter.SHUTTER_GLOBAL, Vac248IpShutter.SHUTTER_ROLLING),
+                                            "get_shutter", "set_shutter"),
+        CameraParameters.VIDEO_FORMAT: ParamSpec(video_format, None, None,
+                                                 (Vac248IpVideoFormat.FORMAT_960x600,
+                                                  Vac248IpVideoFormat.FORMAT_1920x1200),
+                                                 "get_video_format", "set_video_format")
+    }
+    _PARAM_TABLE.update(param_table)
+    # Dictionary for widgets and tests, default values in it can be changed by user
+    camera_parameters = {}
+    for param, spec in param_table.items():
+        info = {DEFAULT: spec.default}
+        if spec.values is None:
+            info[MAX] = spec.maxv
+            info[MIN] = spec.minv
+        else:
+            info[VALUES] = spec.values
+        info[GET] = spec.getter
+        info[SET] = spec.setter
+        camera_parameters[param] = info
+    return {"CAMERA_PARAMETERS": camera_parameters,
+            "GAMMA_DEFAULT": gamma_default,
+            "PARAM_TABLE": param_table,
+            "SHUTTER_DEFAULT": shutter_default,
+            "VIDEO_FORMAT": video_format,
+            "Vac248IpGamma": Vac248IpGamma,
+            "Vac248IpShutter": Vac248IpShutter,
+            "Vac248IpVideoFormat": Vac248IpVideoFormat}
+
+
+def __getattr__(name: str):
+    """
+    Function returns attributes of module that depend on camera SDK. So SDK is not
+    imported until one of these attributes is actually used.
+    :param name: name of attribute.
+    :return: value of attribute.
+    """
+
+    if name not in _SDK_ATTRIBUTES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = _get_sdk_attributes()[name]
+    globals()[name] = value
+    return value
@@ -23,6 +23,7 @@ class DefaultValueWindow(QDialog):
         """
 
         super().__init__(parent, Qt.WindowTitleHint | Qt.WindowCloseButtonHint)
+        # Widget and method to get its value for every parameter
         self._widgets: dict = {}
         self._init_ui(params_info)
 
@@ -48,10 +49,11 @@ class DefaultValueWindow(QDialog):
         :return: spin box.
         """
 
+        max_value, min_value, default_value = info[cn.MAX], info[cn.MIN], info[cn.DEFAULT]
         spin_box = QSpinBox()
-        spin_box.setMaximum(info[cn.MAX])
-        spin_box.setMinimum(info[cn.MIN])
-        spin_box.setValue(info[cn.DEFAULT])
+        spin_box.setMaximum(max_value)
+        spin_box.setMinimum(min_value)
+        spin_box.setValue(default_value)
         return spin_box
 
     def _init_ui(self, params_info: dict):
@@ -62,14 +64,19 @@ class DefaultValueWindow(QDialog):
         """
 
         self.setWindowTitle("Значения по умолчанию")
+        # Window is repainted once after all widgets are added
+        self.setUpdatesEnabled(False)
         form_layout_left = QFormLayout()
         form_layout_right = QFormLayout()
         for index, param in enumerate(cn.CameraParameters.get_all_parameters()):
-            if params_info[param].get(cn.VALUES) is None:
-                widget = self._create_spin_box(params_info[param])
+            info = params_info[param]
+            if info.get(cn.VALUES) is None:
+                widget = self._create_spin_box(info)
+                getter = widget.value
             else:
-                widget = self._create_combo_box(params_info[param])
-            self._widgets[param] = widget
+                widget = self._create_combo_box(info)
+                getter = widget.currentData
+            self._widgets[param] = widget, getter
             if index % 2:
                 form_layout_right.addRow(param.name, widget)
             else:
@@ -92,6 +99,7 @@ class DefaultValueWindow(QDialog):
         v_layout.addLayout(h_layout)
         v_layout.addLayout(h_layout_for_buttons)
         self.setLayout(v_layout)
+        self.setUpdatesEnabled(True)
         self.adjustSize()
 
     @pyqtSlot()
@@ -100,11 +108,24 @@ class DefaultValueWindow(QDialog):
         Slot sets new default values for camera parameters.
         """
 
-        default = {}
-        for param, widget in self._widgets.items():
-            if isinstance(widget, QComboBox):
-                default[param] = widget.currentData()
-            else:
-                default[param] = widget.value()
+        default = {param: getter() for param, (_, getter) in self._widgets.items()}
         self.values_received.emit(default)
         self.close()
+
+    def update_values(self, params_info: dict):
+        """
+        Method sets current default values of camera parameters to widgets. It is
+        used when window is shown again. Only widgets with changed values are
+        updated.
+        :param params_info: dictionary with main information about camera
+        parameters.
+        """
+
+        for param, (widget, getter) in self._widgets.items():
+            default_value = params_info[param][cn.DEFAULT]
+            if getter() == default_value:
+                continue
+            if isinstance(widget, QComboBox):
+                widget.setCurrentIndex(widget.findData(default_value))
+            else:
+                widget.setValue(default_value)
@@ -0,0 +1,54 @@
+"""
+File with fast parser of simple config files with sections and options.
+"""
+
+import re
+
+_OPTION_RE = re.compile(r"^([^=:;#\s][^=:]*?)\s*[=:]\s*(.*?)\s*$")
+_SECTION_RE = re.compile(r"^\[([^\]]+)\]\s*$")
+
+
+def parse(path: str) -> dict:
+    """
+    Function parses config file in INI format. Names of sections are case
+    sensitive, names of options are converted to lower case as in ConfigParser.
+    Interpolation is not supported. If file cannot be read or has wrong format
+    then empty dictionary is returned.
+    :param path: path to config file.
+    :return: dictionary with sections, every section is dictionary with values of
+    options.
+    """
+
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return {}
+    sections = {}
+    section = None
+    option = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped[0] in "#;":
+            continue
+        if line[0].isspace():
+            # Continuation of value of previous option
+            if option is None:
+                return {}
+            section[option] += "\n" + stripped
+            continue
+        match = _SECTION_RE.match(line)
+        if match:
+            if match.group(1) in sections:
+                return {}
+            section = sections[match.group(1)] = {}
+            option = None
+            continue
+        match = _OPTION_RE.match(line)
+        if not match or section is None:
+            return {}
+        option = match.group(1).lower()
+        if option in section:
+            return {}
+        section[option] = match.group(2)
+    return sections
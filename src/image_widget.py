@@ -3,9 +3,10 @@ File with class for creating widget to display image.
 """
 
 import numpy as np
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QSize, Qt
 from PyQt5.QtGui import QImage, QPixmap
-from PyQt5.QtWidgets import QWidget, QGraphicsScene, QGraphicsView, QSizePolicy
+from PyQt5.QtWidgets import QGraphicsPixmapItem, QGraphicsScene, QGraphicsView, QSizePolicy, QWidget
+from . import utils as ut
 
 
 class ImageWidget(QWidget):
@@ -30,29 +31,54 @@ class ImageWidget(QWidget):
         self._view.setResizeAnchor(QGraphicsView.AnchorViewCenter)
         self._view.setAlignment(Qt.AlignCenter)
         self._view.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self._image: QPixmap = None
+        # Array of frame that is shown now. Image is scaled from it when size of
+        # view is changed
+        self._image_array: np.ndarray = None
+        self._pixmap_item: QGraphicsPixmapItem = self._scene.addPixmap(QPixmap())
+        self._scaled_image_size: tuple = None
+        self._view_size: tuple = None
 
-    def _set_image(self, image: QPixmap):
+    def _get_view_size(self) -> tuple:
         """
-        Method sets image to widget.
-        :param image: image to be set.
+        Method returns width and height of view.
+        :return: width and height.
+        """
+
+        return self._view.size().width(), self._view.size().height()
+
+    def _set_pixmap(self, pixmap: QPixmap):
+        """
+        Method sets pixmap scaled to view to widget.
+        :param pixmap: pixmap to be set.
+        """
+
+        self._pixmap_item.setPixmap(pixmap)
+        image_size = pixmap.width(), pixmap.height()
+        if image_size != self._scaled_image_size:
+            self._scaled_image_size = image_size
+            self._scene.setSceneRect(0, 0, *image_size)
+
+    def _show_image_array(self):
+        """
+        Method scales full-size frame to view and shows it.
         """
 
-        self._image = image
-        width = self._view.size().width()
-        height = self._view.size().height()
-        image = image.scaled(width, height, Qt.KeepAspectRatio)
-        self._scene.clear()
-        self._scene.addPixmap(image)
-        self._scene.setSceneRect(0, 0, image.width(), image.height())
+        self._view_size = self._get_view_size()
+        image_array = self._image_array
+        if not image_array.flags["C_CONTIGUOUS"]:
+            image_array = np.ascontiguousarray(image_array)
+        # Image shares memory with array only until scaled copy is created
+        image = ut.create_shared_qimage(image_array).scaled(*self._view_size, Qt.KeepAspectRatio)
+        self._set_pixmap(QPixmap.fromImage(image))
 
     def clear(self):
         """
         Method clears image widget.
         """
 
-        self._image = None
-        self._scene.clear()
+        self._image_array = None
+        self._view_size = None
+        self._pixmap_item.setPixmap(QPixmap())
 
     def create_image(self, image_array: np.ndarray):
         """
@@ -60,12 +86,10 @@ class ImageWidget(QWidget):
         :param image_array: array with data of image.
         """
 
-        if image_array is None:
+        if image_array is None or image_array is self._image_array:
             return
-        gray_scale = QImage.Format_Grayscale16 if image_array.dtype == np.uint16 else QImage.Format_Grayscale8
-        height, width = image_array.shape
-        image = QPixmap(QImage(image_array, width, height, gray_scale))
-        self._set_image(image)
+        self._image_array = image_array
+        self._show_image_array()
 
     def get_view(self) -> QGraphicsView:
         """
@@ -75,10 +99,28 @@ class ImageWidget(QWidget):
 
         return self._view
 
+    def set_image(self, image: QImage, image_array: np.ndarray):
+        """
+        Method sets image that was prepared in another thread to widget.
+        :param image: image scaled to view;
+        :param image_array: array with data of image, it is used when size of view is changed.
+        """
+
+        if image is None or image_array is None:
+            return
+        self._image_array = image_array
+        self._view_size = self._get_view_size()
+        height, width = image_array.shape
+        if image.size() == QSize(width, height).scaled(*self._view_size, Qt.KeepAspectRatio):
+            self._set_pixmap(QPixmap.fromImage(image))
+        else:
+            # Image was prepared for another size of view
+            self._show_image_array()
+
     def scale(self):
         """
         Method scales image size to given width and height.
         """
 
-        if self._image:
-            self._set_image(self._image)
+        if self._image_array is not None and self._get_view_size() != self._view_size:
+            self._show_image_array()
@@ -4,42 +4,87 @@ File with class for main window of application.
 
 import logging
 import os
-import re
-import time
+from collections import OrderedDict
 from typing import Optional
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, QRegExp, QThread
-from PyQt5.QtGui import QCloseEvent, QIcon, QRegExpValidator, QResizeEvent
+from PyQt5.QtCore import pyqtSlot, Q_ARG, QMetaObject, QRegularExpression, Qt, QThread, QThreadPool, QTimer
+from PyQt5.QtGui import QCloseEvent, QIcon, QRegularExpressionValidator, QResizeEvent
 from PyQt5.QtWidgets import QMainWindow, QMessageBox, QVBoxLayout
-from PyQt5.uic import loadUi
 from vac248ip import vac248ip_default_port, Vac248IpCamera, Vac248IpCameraVirtual
 from .dialog_windows import DefaultValueWindow
 from .image_widget import ImageWidget
 from .test_widgets import TestsWidget
 from .tests import Tests
+from .ui_main_window import Ui_MainWindow
+from .workers import OpenDeviceWorker
 from . import config as cn
 from . import utils as ut
 
+_DIR_NAME = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ICON_FILE = os.path.join(_DIR_NAME, "gui", "icon.png")
+# Opened cameras that were disconnected by user, key is IP address with port
+_CAMERA_POOL: OrderedDict = OrderedDict()
+_CAMERA_POOL_SIZE = 4
 
-class MainWindow(QMainWindow):
+
+def _parse_ip(text: str) -> Optional[tuple]:
+    """
+    Function parses IP address and port of camera.
+    :param text: IP address with optional port.
+    :return: IP address and port (None if port is not given) or None if text is
+    not correct.
+    """
+
+    ip_address, separator, port = text.partition(":")
+    if separator and not (port.isdecimal() and port.isascii()):
+        return None
+    if ip_address not in ("virtual", "bad_virtual"):
+        parts = ip_address.split(".")
+        if len(parts) != 4:
+            return None
+        for part in parts:
+            if not (part.isdecimal() and part.isascii() and len(part) <= 3 and int(part) < 256):
+                return None
+    return ip_address, port or None
+
+
+class MainWindow(QMainWindow, Ui_MainWindow):
     """
     Class for main window of application.
     """
 
-    tests_continued = pyqtSignal(int)
+    _IP_OCTET = r"(25[0-5]|2[0-4]\d|[01]?\d?\d)"
+    _IP_REG_EXP = QRegularExpression(rf"^(virtual|bad_virtual|{_IP_OCTET}(\.{_IP_OCTET}){{3}}(:\d+)?)$")
 
     def __init__(self):
         super().__init__()
         self._camera: Vac248IpCamera = None
-        self._config_file = os.path.join(ut.get_dir_name(), cn.CONFIG_FILE)
-        self._camera_params: dict = ut.get_info_about_parameters(self._config_file)
+        self._camera_params: dict = None
+        self._config_file: str = None
+        self._default_value_window: DefaultValueWindow = None
+        self._initialized: bool = False
         self._ip_address: str = None
+        self._last_percent: int = -1
         self._logger: logging.Logger = logging.getLogger("pyvac_test")
+        # Cameras that are being opened in thread pool, value is IP address with port
+        self._opening_cameras: dict = {}
+        # Disconnected cameras that can still be used by test in thread of tests, value
+        # is IP address with port and object with tests that is kept until camera is
+        # released. Cameras are put to pool when test is finished
+        self._releasing_cameras: dict = {}
+        # Several changes of default values in a row are written to config file once
+        self._save_timer: QTimer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(100)
+        self._save_timer.timeout.connect(self._flush_config)
         self._should_stop: bool = False
         self._start_number: int = -1
         self._test_index: int = 0
-        self._thread: QThread = None
         self._tests: Tests = None
-        self._init_ui()
+        self._tests_started: bool = False
+        self._thread: QThread = None
+        self.setWindowTitle("pyvac_test")
+        # Window is shown with empty shell, heavy initialization is run after first paint
+        QTimer.singleShot(0, self._deferred_init)
 
     def _analyze_test_result(self, result: dict):
         """
@@ -52,8 +97,8 @@ class MainWindow(QMainWindow):
             self._logger.error("Test #%s failed", self._test_index)
         else:
             self._logger.info("Test #%s passed", self._test_index)
-        if result[cn.TEST_FRAME] is not None and self.tests_widget.currentIndex() == self._test_index:
-            self.image_widget.create_image(result[cn.TEST_FRAME])
+        if result[cn.TEST_IMAGE] is not None and self.tests_widget.currentIndex() == self._test_index:
+            self.image_widget.set_image(result[cn.TEST_IMAGE], result[cn.TEST_FRAME])
         self.tests_widget.set_test_result(self._test_index, result)
 
     def _connect_camera(self):
@@ -65,60 +110,96 @@ class MainWindow(QMainWindow):
         if self._ip_address is None:
             QMessageBox.information(self, "Информация", "Введите IP адрес камеры")
             return
-        if "virtual" in self._ip_address:
-            self._camera = Vac248IpCameraVirtual(self._ip_address, defer_open=True)
-        else:
-            self._camera = Vac248IpCamera(self._ip_address, defer_open=True, network_operation_timeout=1,
-                                          default_attempts=1)
-        try:
-            self._camera.open_device(1)
-        except Exception:
-            ip_address = self._ip_address
-            self._disconnect_camera()
-            QMessageBox.warning(self, "Ошибка",
-                                f"Не удалось подключить камеру с IP адресом {ip_address}")
-            self._logger.warning("Failed to connect to camera with IP address %s", ip_address)
-            return
-        self.button_connect_or_disconnect.setText("Отключить")
-        self.button_connect_or_disconnect.setChecked(True)
-        self._set_widgets_enabled(True)
-        self._logger.info("Camera with IP address %s was connected", self._ip_address)
+        # Camera is opened in thread pool, window is unlocked when result is received
+        self.button_connect_or_disconnect.setEnabled(False)
+        self.line_edit_ip_address.setEnabled(False)
+        # If camera with the same port is still used by test, camera is opened when
+        # that camera is released
+        if not self._is_port_used_by_test(self._ip_address):
+            self._open_camera()
+
+    def _create_tests_object(self):
+        """
+        Method creates object with tests for connected camera and moves it to
+        thread for tests.
+        """
+
+        self._tests = Tests(self._camera, self._camera_params, self.tests_widget.get_tests(),
+                            self._start_number)
+        self._tests.moveToThread(self._thread)
+        self._tests.camera_released.connect(self.handle_camera_release)
+        self._tests.log_ready.connect(self.print_log)
+        self._tests.test_passed.connect(self.show_test_result)
+        self._set_image_size_for_tests()
 
     def _create_tests_widget(self):
         self.tests_widget = TestsWidget(self._camera_params)
         self.tests_widget.currentChanged.connect(self.show_frame)
         self.scroll_area.setWidget(self.tests_widget)
 
+    @pyqtSlot()
+    def _deferred_init(self):
+        """
+        Slot reads configuration file and initializes widgets on main window. It is
+        called from event loop after window was shown.
+        """
+
+        if self._initialized:
+            return
+        self._config_file = os.path.join(ut.get_dir_name(), cn.CONFIG_FILE)
+        self._camera_params = ut.get_info_about_parameters(self._config_file)
+        self._init_ui()
+        self._initialized = True
+
+    def _delete_tests_object(self):
+        """
+        Method stops tests and deletes object with tests. Camera is released in
+        thread for tests after current test is finished, object with tests is
+        deleted after that.
+        """
+
+        self._tests.stop()
+        QMetaObject.invokeMethod(self._tests, "release_camera", Qt.QueuedConnection)
+        self._tests = None
+        self._tests_started = False
+
     def _disconnect_camera(self):
         """
         Method disconnects camera.
         """
 
         if self._camera:
-            self._camera.close_device()
+            if self._tests:
+                self._releasing_cameras[self._camera] = self._ip_address, self._tests
+            else:
+                self._put_camera_to_pool(self._ip_address, self._camera)
             self._camera = None
             self._logger.info("Camera with IP address %s was disconnected", self._ip_address)
-        if self._thread:
-            self._kill_thread()
+        if self._tests:
+            self._delete_tests_object()
         self._ip_address = None
         self.button_connect_or_disconnect.setText("Подключить")
         self.button_connect_or_disconnect.setChecked(False)
         self._set_widgets_to_initial_state()
         self._set_widgets_enabled(False)
 
+    @pyqtSlot()
+    def _flush_config(self):
+        """
+        Slot writes default values of camera parameters to config file.
+        """
+
+        ut.write_config_file(self._config_file, self._camera_params)
+
     def _get_ip_address(self) -> Optional[str]:
         """
         Method returns IP address and port.
         :return: IP address with port.
         """
 
-        ip_address_and_port = self.line_edit_ip_address.text()
-        reg_exp = (r"^(?P<ip_address>(virtual|bad_virtual|\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}))"
-                   r"(:(?P<port>\d+))?$")
-        result = re.search(reg_exp, ip_address_and_port)
+        result = _parse_ip(self.line_edit_ip_address.text())
         if result:
-            ip_address = result.group("ip_address")
-            port = result.group("port")
+            ip_address, port = result
             port = vac248ip_default_port if port is None else port
             return f"{ip_address}:{port}"
         return None
@@ -128,15 +209,12 @@ class MainWindow(QMainWindow):
         Method initializes widgets on main window.
         """
 
-        dir_name = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        file_name = os.path.join(dir_name, "gui", "main_window.ui")
-        loadUi(file_name, self)
+        self.setupUi(self)
         self.setWindowTitle("pyvac_test")
-        icon = QIcon(os.path.join(dir_name, "gui", "icon.png"))
+        icon = QIcon(_ICON_FILE)
         self.setWindowIcon(icon)
         self.action_default_values.triggered.connect(self.show_dialog_window)
-        reg_exp = QRegExp(r"^(virtual|bad_virtual|\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}(:\d+)?)$")
-        validator = QRegExpValidator(reg_exp, self)
+        validator = QRegularExpressionValidator(self._IP_REG_EXP, self)
         self.line_edit_ip_address.setValidator(validator)
         self.line_edit_ip_address.returnPressed.connect(self.connect_or_disconnect_camera)
         self.button_connect_or_disconnect.clicked.connect(self.connect_or_disconnect_camera)
@@ -148,14 +226,97 @@ class MainWindow(QMainWindow):
         self.widget_for_image.setLayout(layout)
         self._set_widgets_to_initial_state()
         self._set_widgets_enabled(False)
+        # Thread for tests lives until main window is closed
+        self._thread = QThread(parent=self)
+        self._thread.start()
+
+    def _is_port_used_by_test(self, ip_address: str) -> bool:
+        """
+        Method checks whether camera with the same port is still used by test.
+        Cameras are bound to local port equal to port of camera.
+        :param ip_address: IP address with port of camera.
+        :return: True if port is used.
+        """
+
+        port = ip_address.rpartition(":")[2]
+        return any(address.rpartition(":")[2] == port for address, _ in self._releasing_cameras.values())
+
+    def _open_camera(self):
+        """
+        Method takes camera from pool or creates new one and opens it in thread pool.
+        """
+
+        self._camera = self._take_camera_from_pool(self._ip_address)
+        if self._camera is None:
+            if "virtual" in self._ip_address:
+                self._camera = Vac248IpCameraVirtual(self._ip_address, defer_open=True)
+            else:
+                self._camera = Vac248IpCamera(self._ip_address, defer_open=True, network_operation_timeout=1,
+                                              default_attempts=1)
+        self._opening_cameras[self._camera] = self._ip_address
+        worker = OpenDeviceWorker(self._camera, 1)
+        worker.signals.finished.connect(self.handle_camera_opening)
+        QThreadPool.globalInstance().start(worker)
 
-    def _kill_thread(self):
+    @staticmethod
+    def _close_pooled_cameras():
         """
-        Method kills thread in which tests are run.
+        Method closes all cameras in pool.
         """
 
-        self._thread.quit()
-        self._thread = None
+        while _CAMERA_POOL:
+            _, camera = _CAMERA_POOL.popitem()
+            camera.close_device()
+
+    @staticmethod
+    def _put_camera_to_pool(ip_address: str, camera: Vac248IpCamera):
+        """
+        Method puts disconnected camera to pool to reuse it on next connection.
+        Least recently used camera is closed if pool is full.
+        :param ip_address: IP address with port of camera;
+        :param camera: camera.
+        """
+
+        if not camera.is_open:
+            return
+        _CAMERA_POOL[ip_address] = camera
+        _CAMERA_POOL.move_to_end(ip_address)
+        while len(_CAMERA_POOL) > _CAMERA_POOL_SIZE:
+            _, old_camera = _CAMERA_POOL.popitem(last=False)
+            old_camera.close_device()
+
+    def _run_tests_in_thread(self):
+        """
+        Method starts execution of tests in thread of tests from current test.
+        Tests are stopped directly with method stop of object with tests because
+        execution of tests does not return to event loop of thread.
+        """
+
+        run_id = self._tests.new_run()
+        QMetaObject.invokeMethod(self._tests, "run_tests", Qt.QueuedConnection, Q_ARG(int, self._test_index),
+                                 Q_ARG(int, run_id))
+
+    def _set_image_size_for_tests(self):
+        """
+        Method passes size of image view to object with tests so that images of
+        frames are scaled in thread of tests.
+        """
+
+        if self._tests:
+            view_size = self.image_widget.get_view().size()
+            self._tests.set_image_size(view_size.width(), view_size.height())
+
+    def _set_progress(self, tests_done: int, tests_number: int):
+        """
+        Method sets value of progress bar if it has changed.
+        :param tests_done: number of completed tests;
+        :param tests_number: total number of tests.
+        """
+
+        percent = tests_done * 100 // tests_number if tests_number else 0
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.progress_bar.setValue(percent)
 
     def _set_widgets_enabled(self, enabled: bool):
         """
@@ -163,10 +324,12 @@ class MainWindow(QMainWindow):
         :param enabled: if True then widgets will be enabled.
         """
 
+        # Widgets are in different layouts, so window is repainted once after all of them are changed
+        self.central_widget.setUpdatesEnabled(False)
         self.line_edit_ip_address.setEnabled(not enabled)
-        widgets = self.button_start_or_stop_tests, self.tests_widget
-        for widget in widgets:
-            widget.setEnabled(enabled)
+        self.button_start_or_stop_tests.setEnabled(enabled)
+        self.tests_widget.setEnabled(enabled)
+        self.central_widget.setUpdatesEnabled(True)
 
     def _set_widgets_to_initial_state(self):
         """
@@ -174,37 +337,47 @@ class MainWindow(QMainWindow):
         """
 
         self.progress_bar.setVisible(False)
-        self.progress_bar.setValue(0)
+        self._set_progress(0, 0)
         self.button_start_or_stop_tests.setText("Старт")
         self.button_start_or_stop_tests.setChecked(False)
         self.tests_widget.set_to_initial_state()
 
-    def _start_thread_for_tests(self):
+    def _reset_tests_object(self):
         """
-        Method creates thread for tests and runs it.
+        Method stops tests and passes new list of tests to object with tests.
         """
 
-        if self._thread:
-            self._kill_thread()
-        self._thread = QThread(parent=self)
-        self._thread.setTerminationEnabled(True)
-        self._tests = Tests(self._camera, self._camera_params, self.tests_widget.get_tests(),
-                            self._start_number)
-        self._tests.moveToThread(self._thread)
-        self._tests.log_ready.connect(self.print_log)
-        self._tests.test_passed.connect(self.show_test_result)
-        self.tests_continued.connect(self._tests.run_test)
-        self._thread.start()
+        self._tests.stop()
+        QMetaObject.invokeMethod(self._tests, "reset", Qt.QueuedConnection,
+                                 Q_ARG(list, self.tests_widget.get_tests()), Q_ARG(int, self._start_number))
+
+    @staticmethod
+    def _take_camera_from_pool(ip_address: str) -> Optional[Vac248IpCamera]:
+        """
+        Method takes opened camera with given address from pool.
+        :param ip_address: IP address with port of camera.
+        :return: camera or None if there is no opened camera in pool.
+        """
+
+        camera = _CAMERA_POOL.pop(ip_address, None)
+        # Cameras are bound to local port equal to port of camera, so other cameras
+        # with the same port should be closed to free it
+        port = ip_address.rpartition(":")[2]
+        for address in [address for address in _CAMERA_POOL if address.rpartition(":")[2] == port]:
+            _CAMERA_POOL.pop(address).close_device()
+        if camera is not None and not camera.is_open:
+            return None
+        return camera
 
     def _terminate_tests(self):
         """
         Method forcibly terminates tests.
         """
 
-        self._kill_thread()
+        self._tests.stop()
+        self._tests_started = False
         self.button_start_or_stop_tests.setText("Старт")
         self.button_start_or_stop_tests.setChecked(False)
-        time.sleep(0.1)
         self.progress_bar.setVisible(False)
 
     def closeEvent(self, event: QCloseEvent):
@@ -213,7 +386,27 @@ class MainWindow(QMainWindow):
         :param event: close event.
         """
 
-        self._disconnect_camera()
+        # Cameras that are being opened are waited for so that they can be closed
+        QThreadPool.globalInstance().waitForDone()
+        if self._initialized:
+            self._disconnect_camera()
+        for camera in self._opening_cameras:
+            camera.close_device()
+        self._opening_cameras.clear()
+        if self._thread:
+            # Current test is finished before thread quits
+            self._thread.quit()
+            self._thread.wait()
+            self._thread.deleteLater()
+            self._thread = None
+        # Tests are finished, so released cameras are not used anymore
+        for camera in self._releasing_cameras:
+            camera.close_device()
+        self._releasing_cameras.clear()
+        self._close_pooled_cameras()
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._flush_config()
         super().closeEvent(event)
 
     @pyqtSlot()
@@ -227,15 +420,63 @@ class MainWindow(QMainWindow):
         else:
             self._disconnect_camera()
 
-    @pyqtSlot(str)
-    def print_log(self, log: str):
+    @pyqtSlot(object, bool, str)
+    def handle_camera_opening(self, camera: Vac248IpCamera, success: bool, error: str):
+        """
+        Slot handles result of opening camera.
+        :param camera: camera that was opened;
+        :param success: if True then camera was opened;
+        :param error: text of error if camera was not opened.
+        """
+
+        ip_address = self._opening_cameras.pop(camera, None)
+        if camera is not self._camera:
+            # Camera was disconnected or replaced while it was being opened
+            if ip_address is None:
+                camera.close_device()
+            else:
+                self._put_camera_to_pool(ip_address, camera)
+            if self._camera is None:
+                self.button_connect_or_disconnect.setEnabled(True)
+            return
+        self.button_connect_or_disconnect.setEnabled(True)
+        if not success:
+            ip_address = self._ip_address
+            self._disconnect_camera()
+            QMessageBox.warning(self, "Ошибка",
+                                f"Не удалось подключить камеру с IP адресом {ip_address}")
+            self._logger.warning("Failed to connect to camera with IP address %s: %s", ip_address, error)
+            return
+        self._create_tests_object()
+        self.button_connect_or_disconnect.setText("Отключить")
+        self.button_connect_or_disconnect.setChecked(True)
+        self._set_widgets_enabled(True)
+        self._logger.info("Camera with IP address %s was connected", self._ip_address)
+
+    @pyqtSlot(object)
+    def handle_camera_release(self, camera: Vac248IpCamera):
+        """
+        Slot puts disconnected camera to pool when test that used it is finished.
+        :param camera: released camera.
+        """
+
+        if camera not in self._releasing_cameras:
+            return
+        ip_address, _ = self._releasing_cameras.pop(camera)
+        self._put_camera_to_pool(ip_address, camera)
+        if self._camera is None and self._ip_address is not None and not self._is_port_used_by_test(self._ip_address):
+            # Connection was waiting for port to be released
+            self._open_camera()
+
+    @pyqtSlot(list)
+    def print_log(self, logs: list):
         """
-        Slot prints log.
-        :param log: log.
+        Slot prints logs from thread of tests.
+        :param logs: list of logs.
         """
 
         if not self._should_stop:
-            self._logger.info(log)
+            self._logger.info("\n".join(logs))
 
     def resizeEvent(self, event: QResizeEvent):
         """
@@ -243,7 +484,9 @@ class MainWindow(QMainWindow):
         :param event: resizing event.
         """
 
-        self.image_widget.scale()
+        if self._initialized:
+            self.image_widget.scale()
+            self._set_image_size_for_tests()
         super().resizeEvent(event)
 
     @pyqtSlot()
@@ -257,15 +500,16 @@ class MainWindow(QMainWindow):
         self.tests_widget.set_to_initial_state()
         self._start_number += 1
         self._test_index = test_index
-        self._start_thread_for_tests()
-        self.tests_continued.emit(self._test_index)
+        self._tests_started = True
+        self._reset_tests_object()
+        self._run_tests_in_thread()
         self.button_start_or_stop_tests.setText("Стоп")
         self.button_start_or_stop_tests.setChecked(True)
         tests_number = self.tests_widget.get_tests_number()
         if self._test_index == tests_number:
             self._terminate_tests()
         else:
-            self.progress_bar.setValue(int(test_index / tests_number * 100))
+            self._set_progress(test_index, tests_number)
             self.progress_bar.setVisible(True)
         if log:
             self._logger.info("Tests were started")
@@ -280,7 +524,7 @@ class MainWindow(QMainWindow):
 
         for param, new_value in dict_with_values.items():
             self._camera_params[param][cn.DEFAULT] = new_value
-        ut.write_config_file(self._config_file, self._camera_params)
+        self._save_timer.start()
 
     @pyqtSlot()
     def show_dialog_window(self):
@@ -288,9 +532,12 @@ class MainWindow(QMainWindow):
         Slot shows dialog windows to set default values for camera parameters.
         """
 
-        dialog_wnd = DefaultValueWindow(self, self._camera_params)
-        dialog_wnd.values_received.connect(self.set_default_values)
-        dialog_wnd.exec()
+        if self._default_value_window is None:
+            self._default_value_window = DefaultValueWindow(self, self._camera_params)
+            self._default_value_window.values_received.connect(self.set_default_values)
+        else:
+            self._default_value_window.update_values(self._camera_params)
+        self._default_value_window.exec()
 
     @pyqtSlot(int)
     def show_frame(self, index: int):
@@ -314,17 +561,15 @@ class MainWindow(QMainWindow):
         :param result: dictionary with results of test.
         """
 
-        if self._start_number != tests_id or self._should_stop:
+        if self._start_number != tests_id or self._should_stop or index != self._test_index:
             return
         tests_number = self.tests_widget.get_tests_number()
-        self.progress_bar.setValue(int((index + 1) / tests_number * 100))
+        self._set_progress(index + 1, tests_number)
         self._analyze_test_result(result)
         self._test_index += 1
         if self._test_index == tests_number:
             self._terminate_tests()
             self._logger.info("Execution of tests was completed")
-            return
-        self.tests_continued.emit(self._test_index)
 
     @pyqtSlot(bool)
     def start_or_stop_tests(self, start: bool):
@@ -335,14 +580,15 @@ class MainWindow(QMainWindow):
         """
 
         self._should_stop = not start
-        if start and self._thread is None:
+        if start and not self._tests_started:
             self.restart_tests()
             return
         if start:
-            self.tests_continued.emit(self._test_index)
+            self._run_tests_in_thread()
             button_text = "Стоп"
             logger_msg = "Execution of tests was continued"
         else:
+            self._tests.stop()
             button_text = "Старт"
             logger_msg = "Execution of tests was paused"
         self._logger.info(logger_msg)
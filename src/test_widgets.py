@@ -2,7 +2,7 @@
 File with class for widget to show information about tests.
 """
 
-from functools import partial
+from typing import Optional
 import numpy as np
 from PyQt5.QtCore import pyqtSlot, Qt
 from PyQt5.QtGui import QPalette
@@ -10,6 +10,9 @@ from PyQt5.QtWidgets import (QAbstractButton, QCheckBox, QFormLayout, QLabel, QL
                              QToolBox, QVBoxLayout, QWidget)
 from . import config as cn
 
+# Keys of test dictionary with result of test
+_RESULT_KEYS = cn.TEST_ERROR, cn.TEST_FRAME, cn.TEST_FRAME_GOOD, cn.TEST_RESULT
+
 
 class TestsWidget(QToolBox):
     """
@@ -22,8 +25,12 @@ class TestsWidget(QToolBox):
         """
 
         super().__init__()
+        self._palettes: dict = {}
         self._params_info: dict = params_info
         self._tests: list = []
+        # Ranges and values of parameters from which current tests were created
+        self._tests_key: tuple = None
+        self._toolbox_buttons: list = []
         self._widgets_for_tests: list = []
 
     def _clear(self):
@@ -31,9 +38,16 @@ class TestsWidget(QToolBox):
         Method clears widget for tests.
         """
 
-        for index in range(len(self._tests) - 1, -1, -1):
+        self.setUpdatesEnabled(False)
+        for index in range(self.count() - 1, -1, -1):
+            widget = self.widget(index)
             self.removeItem(index)
+            # Tool box does not delete removed page
+            widget.deleteLater()
         self._tests.clear()
+        self._toolbox_buttons = []
+        self._widgets_for_tests = []
+        self.setUpdatesEnabled(True)
 
     def _create_tests(self) -> list:
         """
@@ -73,36 +87,46 @@ class TestsWidget(QToolBox):
         :return: list with tests for given camera parameter.
         """
 
-        values = (param_info[cn.MIN], int((param_info[cn.MIN] + param_info[cn.MAX]) // 2),
-                  param_info[cn.MAX])
+        min_value, max_value = param_info[cn.MIN], param_info[cn.MAX]
+        values = min_value, (min_value + max_value) // 2, max_value
         tests = [{cn.PARAMETER: param,
                   cn.GET: param_info[cn.GET],
                   cn.SET: param_info[cn.SET],
                   cn.VALUE: value} for value in values]
         return tests
 
+    @pyqtSlot(int)
+    def _handle_frame_good_state(self, state: int):
+        """
+        Slot handles change of state of check box for good frame. Index of test is
+        stored in property of check box.
+        :param state: state of check box.
+        """
+
+        self.set_image_property(self.sender().property("test_index"), state)
+
     def _init_ui(self):
         """
         Method initializes widgets.
         """
 
+        # Tool box is repainted once after all pages are added
+        self.setUpdatesEnabled(False)
         self._widgets_for_tests = []
-        for index, test in enumerate(self._tests):
+        all_params = cn.CameraParameters.get_all_parameters()
+        default_texts = self._get_default_texts()
+        for index in range(len(self._tests)):
             form_layout = QFormLayout()
-            for param in cn.CameraParameters.get_all_parameters():
+            line_edits = {}
+            for param in all_params:
                 line_edit = QLineEdit()
                 line_edit.setReadOnly(True)
-                if param == test[cn.PARAMETER]:
-                    value = test[cn.VALUE]
-                else:
-                    value = self._params_info[param][cn.DEFAULT]
-                if hasattr(value, "name"):
-                    value = value.name
-                line_edit.setText(str(value))
+                line_edits[param] = line_edit
                 form_layout.addRow(QLabel(param.name), line_edit)
             frame_good = QCheckBox()
             frame_good.setEnabled(False)
-            frame_good.stateChanged.connect(partial(self.set_image_property, index))
+            frame_good.setProperty("test_index", index)
+            frame_good.stateChanged.connect(self._handle_frame_good_state)
             form_layout.addRow(QLabel("Кадр хороший"), frame_good)
             test_passed = QCheckBox()
             test_passed.setEnabled(False)
@@ -113,26 +137,93 @@ class TestsWidget(QToolBox):
             msg.setReadOnly(True)
             msg.setVisible(False)
             layout.addWidget(msg)
-            self._widgets_for_tests.append({"test_passed": test_passed,
+            self._widgets_for_tests.append({"line_edits": line_edits,
+                                            "test_passed": test_passed,
                                             "frame_good": frame_good,
                                             "msg": msg})
+            self._set_initial_values(index, default_texts)
             widget = QWidget()
             widget.setLayout(layout)
             self.addItem(widget, f"Тест #{index}")
+        # Buttons of tool box tabs are found once, colors of tabs are changed often
+        self._toolbox_buttons = [btn for btn in self.findChildren(QAbstractButton)
+                                 if btn.metaObject().className() == "QToolBoxButton"]
+        self.setUpdatesEnabled(True)
 
-    def _set_color(self, test_index: int, result: bool):
+    def _set_color(self, test_index: int, result: Optional[bool]):
         """
         Method sets special color for test tab in tool box.
         :param test_index: index of test;
-        :param result: if True then test is passed otherwise test is failed.
+        :param result: if True then test is passed otherwise test is failed. If None
+        then color is reset.
+        """
+
+        button = self._toolbox_buttons[test_index]
+        if result is None:
+            # Palette without explicitly set colors, so button gets colors of tool box
+            button.setPalette(QPalette())
+            return
+        palette = self._palettes.get(result)
+        if palette is None:
+            palette = QPalette(button.palette())
+            palette.setColor(QPalette.Button, Qt.green if result else Qt.red)
+            self._palettes[result] = palette
+        button.setPalette(palette)
+
+    def _get_tests_key(self) -> tuple:
+        """
+        Method returns ranges and values of camera parameters that define tests.
+        Default values do not change tests, so they are not included.
+        :return: tuple with ranges and values of camera parameters.
+        """
+
+        return tuple((param, param_info.get(cn.MIN), param_info.get(cn.MAX),
+                      tuple(param_info.get(cn.VALUES, ())))
+                     for param, param_info in self._params_info.items())
+
+    def _get_default_texts(self) -> dict:
+        """
+        Method returns texts with default values of camera parameters.
+        :return: dictionary with texts of default values.
+        """
+
+        return {param: self._get_value_text(self._params_info[param][cn.DEFAULT])
+                for param in cn.CameraParameters.get_all_parameters()}
+
+    @staticmethod
+    def _get_value_text(value) -> str:
+        """
+        Method returns text to show value of camera parameter.
+        :param value: value of camera parameter.
+        :return: text of value.
+        """
+
+        if hasattr(value, "name"):
+            value = value.name
+        return str(value)
+
+    def _set_initial_values(self, test_index: int, default_texts: dict):
+        """
+        Method shows values of camera parameters for test and clears result of test.
+        :param test_index: index of test;
+        :param default_texts: dictionary with texts of default values of camera parameters.
         """
 
-        color = Qt.green if result else Qt.red
-        buttons = self.findChildren(QAbstractButton)
-        buttons = [btn for btn in buttons if btn.metaObject().className() == "QToolBoxButton"]
-        palette = buttons[test_index].palette()
-        palette.setColor(QPalette.Button, color)
-        buttons[test_index].setPalette(palette)
+        test = self._tests[test_index]
+        widgets = self._widgets_for_tests[test_index]
+        for param, line_edit in widgets["line_edits"].items():
+            if param == test[cn.PARAMETER]:
+                line_edit.setText(self._get_value_text(test[cn.VALUE]))
+            else:
+                line_edit.setText(default_texts[param])
+        # Signal is blocked, otherwise test will be marked as failed
+        widgets["frame_good"].blockSignals(True)
+        widgets["frame_good"].setChecked(False)
+        widgets["frame_good"].blockSignals(False)
+        widgets["frame_good"].setEnabled(False)
+        widgets["test_passed"].setChecked(False)
+        widgets["msg"].clear()
+        widgets["msg"].setVisible(False)
 
     def get_frame(self, index: int) -> np.ndarray:
         """
@@ -197,6 +288,27 @@ class TestsWidget(QToolBox):
         Method sets widgets to initial state.
         """
 
-        self._clear()
-        self._tests = self._create_tests()
-        self._init_ui()
+        tests_key = self._get_tests_key()
+        if tests_key == self._tests_key and self._tests:
+            # Tests are the same, only their results are removed
+            for test in self._tests:
+                for key in _RESULT_KEYS:
+                    test.pop(key, None)
+        else:
+            self._tests_key = tests_key
+            tests = self._create_tests()
+            if len(tests) != len(self._widgets_for_tests):
+                self._clear()
+                self._tests = tests
+                self._init_ui()
+                return
+            self._tests = tests
+        # Widgets of tests are reused, only values in them are reset
+        default_texts = self._get_default_texts()
+        for index in range(len(self._tests)):
+            self._set_initial_values(index, default_texts)
+            self._set_color(index, None)
+        if self.currentIndex() == 0:
+            self.currentChanged.emit(0)
+        else:
+            self.setCurrentIndex(0)
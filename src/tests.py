@@ -2,11 +2,15 @@
 File with tests.
 """
 
+import collections
+import logging
+import time
 from enum import auto, Enum
 from typing import Optional
 from PyQt5.QtCore import pyqtSignal, pyqtSlot, QObject
 from vac248ip import Vac248IpCamera
 from . import config as cn
+from . import utils as ut
 
 
 class CameraParameters(Enum):
@@ -19,12 +23,22 @@ class CameraParameters(Enum):
     VIDEO_FORMAT = auto()
 
 
+# Logs of tests are sent to main thread when there are so many of them or when
+# so many seconds have passed since previous sending
+LOGS_BATCH_PERIOD = 0.016
+LOGS_BATCH_SIZE = 32
+
+# Test with methods of camera to get and set tested parameter
+TestSpec = collections.namedtuple("TestSpec", "parameter value get set")
+
+
 class Tests(QObject):
     """
     Class with tests for camera.
     """
 
-    log_ready: pyqtSignal = pyqtSignal(str)
+    camera_released: pyqtSignal = pyqtSignal(object)
+    log_ready: pyqtSignal = pyqtSignal(list)
     test_passed: pyqtSignal = pyqtSignal(int, int, dict)
 
     def __init__(self, camera: Vac248IpCamera, params_info: dict, tests: Optional[list] = None,
@@ -38,9 +52,68 @@ class Tests(QObject):
 
         super().__init__()
         self._camera: Vac248IpCamera = camera
+        # Values of parameters that were set to camera and checked. Parameters with
+        # these values are not set again before next test
+        self._camera_values: dict = {}
         self._id: int = tests_id
+        self._image_size: tuple = None
+        self._logger: logging.Logger = logging.getLogger("pyvac_test")
+        self._logs: list = []
+        self._logs_time: float = time.monotonic()
         self._params_info: dict = params_info
-        self._tests: list = tests
+        # Methods of camera to get and set parameters are found once. Default values
+        # are read from dictionaries with information because they can be changed
+        self._params_methods: list = [(param, param_info, getattr(camera, param_info[cn.GET]),
+                                       getattr(camera, param_info[cn.SET]))
+                                      for param, param_info in params_info.items()]
+        # ID of run of tests that is allowed to be executed, it is changed only in main thread
+        self._run_id: int = 0
+        self._tests: list = self._prepare_tests(tests)
+
+    def _flush_logs(self):
+        """
+        Method sends accumulated logs to main thread.
+        """
+
+        if self._logs:
+            self.log_ready.emit(self._logs)
+            self._logs = []
+        self._logs_time = time.monotonic()
+
+    def _log(self, log: str, *args):
+        """
+        Method adds log to buffer. Logs are sent to main thread in batches.
+        :param log: log, it is formatted with arguments only if log will be printed;
+        :param args: arguments for log.
+        """
+
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
+        self._logs.append(log.format(*args) if args else log)
+        if len(self._logs) >= LOGS_BATCH_SIZE or time.monotonic() - self._logs_time >= LOGS_BATCH_PERIOD:
+            self._flush_logs()
+
+    def _prepare_tests(self, tests: Optional[list]) -> list:
+        """
+        Method converts dictionaries with tests to tuples with methods of camera to
+        get and set tested parameters.
+        :param tests: list of tests.
+        :return: list of tests.
+        """
+
+        return [TestSpec(test[cn.PARAMETER], test[cn.VALUE], getattr(self._camera, test[cn.GET]),
+                         getattr(self._camera, test[cn.SET])) for test in tests or []]
+
+    def _send_result(self, test_index: int, result: dict):
+        """
+        Method sends result of test to main thread. Logs of test are sent before
+        result to keep order of records.
+        :param test_index: index of test;
+        :param result: dictionary with result of test.
+        """
+
+        self._flush_logs()
+        self.test_passed.emit(test_index, self._id, result)
 
     def _set_auto_or_manual_regime(self, log_base: str, parameter: cn.CameraParameters
                                    ) -> Optional[str]:
@@ -53,24 +126,29 @@ class Tests(QObject):
 
         auto_mode = cn.CameraParameters.is_auto_required(parameter)
         mode = "auto" if auto_mode else "manual"
+        if auto_mode:
+            # In auto mode camera can change values of parameters itself
+            self._camera_values.clear()
         try:
             self._camera.set_auto_gain_expo(auto_mode)
         except Exception:
             return f"{log_base} failed to set {mode} mode for gain/exposure"
-        self.log_ready.emit(f"{log_base} set to {mode} mode for gain/exposure")
+        self._log("{} set to {} mode for gain/exposure", log_base, mode)
         return None
 
     def _set_default_values(self, log_base: str) -> Optional[str]:
         """
-        Method sets default values to camera.
+        Method sets default values to camera. Parameters that already have default
+        values on camera are skipped.
         :param log_base: base for logging.
         :return: text of exception.
         """
 
-        for param, param_info in self._params_info.items():
-            get_method = getattr(self._camera, param_info[cn.GET])
-            set_method = getattr(self._camera, param_info[cn.SET])
+        for param, param_info, get_method, set_method in self._params_methods:
             default_value = param_info[cn.DEFAULT]
+            if param in self._camera_values and self._camera_values[param] == default_value:
+                continue
+            self._camera_values.pop(param, None)
             try:
                 set_method(default_value)
             except Exception:
@@ -86,8 +164,8 @@ class Tests(QObject):
                 exc_text = (f"{log_base} parameter '{param.name}' has been set value "
                             f"'{default_value}', but read value is '{value_real}'")
                 return exc_text
-            self.log_ready.emit(f"{log_base} parameter '{param.name}' set to default value "
-                                f"'{default_value}'")
+            self._camera_values[param] = default_value
+            self._log("{} parameter '{}' set to default value '{}'", log_base, param.name, default_value)
         return None
 
     @pyqtSlot(int)
@@ -101,57 +179,121 @@ class Tests(QObject):
             return
         result = {cn.TEST_RESULT: True,
                   cn.TEST_ERROR: "",
-                  cn.TEST_FRAME: None}
+                  cn.TEST_FRAME: None,
+                  cn.TEST_IMAGE: None}
         log_base = f"Test #{test_index}:"
-        test_params = self._tests[test_index]
-        parameter = test_params[cn.PARAMETER]
-        get_method = getattr(self._camera, test_params[cn.GET])
-        set_method = getattr(self._camera, test_params[cn.SET])
-        value_to_be = test_params[cn.VALUE]
+        parameter, value_to_be, get_method, set_method = self._tests[test_index]
         exc_text = self._set_default_values(log_base)
         if exc_text is not None:
             result[cn.TEST_RESULT] = False
             result[cn.TEST_ERROR] = exc_text
-            self.test_passed.emit(test_index, self._id, result)
+            self._send_result(test_index, result)
             return
         exc_text = self._set_auto_or_manual_regime(log_base, parameter)
         if exc_text is not None:
             result[cn.TEST_RESULT] = False
             result[cn.TEST_ERROR] = exc_text
-            self.test_passed.emit(test_index, self._id, result)
+            self._send_result(test_index, result)
             return
+        self._camera_values.pop(parameter, None)
         try:
             set_method(value_to_be)
-            self.log_ready.emit(f"{log_base} parameter '{parameter.name}' set to value "
-                                f"'{value_to_be}'")
+            self._log("{} parameter '{}' set to value '{}'", log_base, parameter.name, value_to_be)
         except Exception:
             result[cn.TEST_RESULT] = False
             result[cn.TEST_ERROR] = (f"{log_base} failed to set value '{value_to_be}' to "
                                      f"parameter '{parameter.name}'")
-            self.test_passed.emit(test_index, self._id, result)
+            self._send_result(test_index, result)
             return
         try:
             value_real = get_method()
-            self.log_ready.emit(f"{log_base} read value '{value_real}' of parameter "
-                                f"'{parameter.name}'")
+            self._log("{} read value '{}' of parameter '{}'", log_base, value_real, parameter.name)
         except Exception:
             result[cn.TEST_RESULT] = False
             result[cn.TEST_ERROR] = (f"{log_base} failed to read value of parameter "
                                      f"'{parameter.name}'")
-            self.test_passed.emit(test_index, self._id, result)
+            self._send_result(test_index, result)
             return
         if value_to_be != value_real:
             result[cn.TEST_RESULT] = False
             result[cn.TEST_ERROR] = (f"{log_base} parameter '{parameter.name}' has been set value "
                                      f"'{value_to_be}', but read value is '{value_real}'")
-            self.test_passed.emit(test_index, self._id, result)
+            self._send_result(test_index, result)
             return
+        self._camera_values[parameter] = value_real
         try:
             result[cn.TEST_FRAME] = self._camera.get_frame(attempts=1)[0]
         except Exception:
             result[cn.TEST_RESULT] = False
             result[cn.TEST_ERROR] = f"{log_base} failed to get frame"
-            self.test_passed.emit(test_index, self._id, result)
+            self._send_result(test_index, result)
             return
-        self.log_ready.emit(f"{log_base} frame was received")
-        self.test_passed.emit(test_index, self._id, result)
+        self._log("{} frame was received", log_base)
+        # Image to be shown is prepared here so that main thread only draws it
+        result[cn.TEST_IMAGE] = ut.create_qimage(result[cn.TEST_FRAME], self._image_size)
+        self._send_result(test_index, result)
+
+    def new_run(self) -> int:
+        """
+        Method stops previous run of tests and creates ID for new run. Method is
+        called from main thread.
+        :return: ID of new run of tests.
+        """
+
+        self._run_id += 1
+        return self._run_id
+
+    @pyqtSlot()
+    def release_camera(self):
+        """
+        Slot sends camera to main thread when it is no longer used. Slot is run in
+        thread of tests, so it is run only after current test is finished.
+        """
+
+        self.camera_released.emit(self._camera)
+
+    @pyqtSlot(list, int)
+    def reset(self, tests: list, tests_id: int):
+        """
+        Slot sets new list of tests.
+        :param tests: list of tests;
+        :param tests_id: ID of tests.
+        """
+
+        self._camera_values.clear()
+        self._tests = self._prepare_tests(tests)
+        self._id = tests_id
+
+    @pyqtSlot(int, int)
+    def run_tests(self, test_index: int, run_id: int):
+        """
+        Slot runs tests one after another starting from given test until all tests
+        are run or given run of tests is stopped.
+        :param test_index: index of first test to run;
+        :param run_id: ID of run of tests.
+        """
+
+        # State of camera could be changed between runs
+        self._camera_values.clear()
+        for index in range(max(test_index, 0), len(self._tests)):
+            if run_id != self._run_id:
+                break
+            self.run_test(index)
+
+    def set_image_size(self, width: int, height: int):
+        """
+        Method sets size of area where images of frames are shown. Method is
+        called from main thread.
+        :param width: width of area;
+        :param height: height of area.
+        """
+
+        self._image_size = width, height
+
+    def stop(self):
+        """
+        Method stops execution of tests after current test. Method is called from
+        main thread.
+        """
+
+        self._run_id += 1
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'gui/main_window.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(673, 440)
+        self.central_widget = QtWidgets.QWidget(MainWindow)
+        self.central_widget.setObjectName("central_widget")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.central_widget)
+        self.verticalLayout.setContentsMargins(9, 9, 9, 9)
+        self.verticalLayout.setSpacing(6)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.horizontal_layout = QtWidgets.QHBoxLayout()
+        self.horizontal_layout.setObjectName("horizontal_layout")
+        self.label_ip_address = QtWidgets.QLabel(self.central_widget)
+        self.label_ip_address.setObjectName("label_ip_address")
+        self.horizontal_layout.addWidget(self.label_ip_address)
+        self.line_edit_ip_address = QtWidgets.QLineEdit(self.central_widget)
+        self.line_edit_ip_address.setObjectName("line_edit_ip_address")
+        self.horizontal_layout.addWidget(self.line_edit_ip_address)
+        self.button_connect_or_disconnect = QtWidgets.QPushButton(self.central_widget)
+        self.button_connect_or_disconnect.setMinimumSize(QtCore.QSize(100, 0))
+        self.button_connect_or_disconnect.setMaximumSize(QtCore.QSize(100, 16777215))
+        self.button_connect_or_disconnect.setCheckable(True)
+        self.button_connect_or_disconnect.setObjectName("button_connect_or_disconnect")
+        self.horizontal_layout.addWidget(self.button_connect_or_disconnect)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontal_layout.addItem(spacerItem)
+        self.button_start_or_stop_tests = QtWidgets.QPushButton(self.central_widget)
+        self.button_start_or_stop_tests.setMinimumSize(QtCore.QSize(100, 0))
+        self.button_start_or_stop_tests.setMaximumSize(QtCore.QSize(100, 16777215))
+        self.button_start_or_stop_tests.setCheckable(True)
+        self.button_start_or_stop_tests.setObjectName("button_start_or_stop_tests")
+        self.horizontal_layout.addWidget(self.button_start_or_stop_tests)
+        self.verticalLayout.addLayout(self.horizontal_layout)
+        self.horizontal_layout_2 = QtWidgets.QHBoxLayout()
+        self.horizontal_layout_2.setObjectName("horizontal_layout_2")
+        self.group_box_tests = QtWidgets.QGroupBox(self.central_widget)
+        self.group_box_tests.setMinimumSize(QtCore.QSize(300, 0))
+        self.group_box_tests.setMaximumSize(QtCore.QSize(200, 16777215))
+        self.group_box_tests.setObjectName("group_box_tests")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.group_box_tests)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.scroll_area = QtWidgets.QScrollArea(self.group_box_tests)
+        self.scroll_area.setMaximumSize(QtCore.QSize(300, 16777215))
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setObjectName("scroll_area")
+        self.scroll_area_widget_contents = QtWidgets.QWidget()
+        self.scroll_area_widget_contents.setGeometry(QtCore.QRect(0, 0, 278, 306))
+        self.scroll_area_widget_contents.setObjectName("scroll_area_widget_contents")
+        self.scroll_area.setWidget(self.scroll_area_widget_contents)
+        self.verticalLayout_2.addWidget(self.scroll_area)
+        self.horizontal_layout_2.addWidget(self.group_box_tests)
+        self.widget_for_image = QtWidgets.QWidget(self.central_widget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.widget_for_image.sizePolicy().hasHeightForWidth())
+        self.widget_for_image.setSizePolicy(sizePolicy)
+        self.widget_for_image.setObjectName("widget_for_image")
+        self.horizontal_layout_2.addWidget(self.widget_for_image)
+        self.verticalLayout.addLayout(self.horizontal_layout_2)
+        self.progress_bar = QtWidgets.QProgressBar(self.central_widget)
+        self.progress_bar.setProperty("value", 0)
+        self.progress_bar.setObjectName("progress_bar")
+        self.verticalLayout.addWidget(self.progress_bar)
+        MainWindow.setCentralWidget(self.central_widget)
+        self.menubar = QtWidgets.QMenuBar(MainWindow)
+        self.menubar.setGeometry(QtCore.QRect(0, 0, 673, 21))
+        self.menubar.setObjectName("menubar")
+        self.menu = QtWidgets.QMenu(self.menubar)
+        self.menu.setObjectName("menu")
+        MainWindow.setMenuBar(self.menubar)
+        self.action_test_settings = QtWidgets.QAction(MainWindow)
+        self.action_test_settings.setObjectName("action_test_settings")
+        self.action_default_values = QtWidgets.QAction(MainWindow)
+        self.action_default_values.setObjectName("action_default_values")
+        self.menu.addAction(self.action_default_values)
+        self.menubar.addAction(self.menu.menuAction())
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "MainWindow"))
+        self.label_ip_address.setText(_translate("MainWindow", "IP адрес"))
+        self.line_edit_ip_address.setPlaceholderText(_translate("MainWindow", "0.0.0.0[:0]"))
+        self.button_connect_or_disconnect.setText(_translate("MainWindow", "Подключить"))
+        self.button_start_or_stop_tests.setText(_translate("MainWindow", "Старт"))
+        self.group_box_tests.setTitle(_translate("MainWindow", "Тесты"))
+        self.menu.setTitle(_translate("MainWindow", "Настройки"))
+        self.action_test_settings.setText(_translate("MainWindow", "Настройки тестов"))
+        self.action_default_values.setText(_translate("MainWindow", "Значения по умолчанию"))
@@ -3,11 +3,58 @@ File with useful functions.
 """
 
 import configparser
+import copy
+import functools
+import io
 import os
 import sys
+from typing import Optional
+import numpy as np
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
 from . import config as cn
+from . import fast_config
 
+# Information about camera parameters read from config files. Key is name of file,
+# value is modification time and size of file and information
+_CONFIG_CACHE: dict = {}
+# Contents of config files written by application. Key is name of file, value is
+# modification time and size of file after writing and contents
+_WRITTEN_CONFIGS: dict = {}
 
+
+def create_qimage(image_array: np.ndarray, size: Optional[tuple] = None) -> QImage:
+    """
+    Function creates image from array with data of frame. Function can be called
+    from any thread.
+    :param image_array: array with data of frame;
+    :param size: width and height of area where image will be shown. If given
+    then image is scaled to this area keeping aspect ratio.
+    :return: image that does not share memory with array.
+    """
+
+    if not image_array.flags["C_CONTIGUOUS"]:
+        image_array = np.ascontiguousarray(image_array)
+    image = create_shared_qimage(image_array)
+    if size is not None and size[0] > 0 and size[1] > 0:
+        return image.scaled(size[0], size[1], Qt.KeepAspectRatio)
+    return image.copy()
+
+
+def create_shared_qimage(image_array: np.ndarray) -> QImage:
+    """
+    Function creates image that uses data of array without copying.
+    :param image_array: C-contiguous array with data of frame. Array must live
+    while image is used.
+    :return: image.
+    """
+
+    gray_scale = QImage.Format_Grayscale16 if image_array.dtype == np.uint16 else QImage.Format_Grayscale8
+    height, width = image_array.shape
+    return QImage(image_array.data, width, height, image_array.strides[0], gray_scale)
+
+
+@functools.lru_cache(maxsize=1)
 def get_dir_name() -> str:
     """
     Function returns path to directory with executable file or code files.
@@ -29,10 +76,18 @@ def get_info_about_parameters(config_file: str) -> dict:
     dictionary with test settings.
     """
 
-    camera_info = cn.CAMERA_PARAMETERS
-    if os.path.exists(config_file):
+    try:
+        stat = os.stat(config_file)
+    except OSError:
+        return copy.deepcopy(cn.CAMERA_PARAMETERS)
+    # File is parsed again only if it has been changed
+    key = stat.st_mtime_ns, stat.st_size
+    cached = _CONFIG_CACHE.get(config_file)
+    if cached is None or cached[0] != key:
+        camera_info = copy.deepcopy(cn.CAMERA_PARAMETERS)
         read_config_file(config_file, camera_info)
-    return camera_info
+        cached = _CONFIG_CACHE[config_file] = key, camera_info
+    return copy.deepcopy(cached[1])
 
 
 def read_config_file(file_name: str, camera_info: dict):
@@ -42,18 +97,11 @@ def read_config_file(file_name: str, camera_info: dict):
     :param camera_info: dictionary with main information about camera parameters.
     """
 
-    config_parser = configparser.ConfigParser()
-    try:
-        config_parser.read(file_name)
-    except (configparser.DuplicateOptionError, configparser.DuplicateSectionError,
-            configparser.MissingSectionHeaderError, configparser.ParsingError):
-        config_parser.clear()
-    if not config_parser.has_section("DEFAULT_VALUES"):
-        config_parser.add_section("DEFAULT_VALUES")
+    default_values = fast_config.parse(file_name).get("DEFAULT_VALUES", {})
     for param in cn.CameraParameters.get_all_parameters():
         try:
-            value = config_parser.getint("DEFAULT_VALUES", param.name,
-                                         fallback=camera_info[param][cn.DEFAULT])
+            value = default_values.get(param.name.lower())
+            value = camera_info[param][cn.DEFAULT] if value is None else int(value)
             camera_info[param][cn.DEFAULT] = cn.CameraParameters.get_value(param, value)
         except (KeyError, ValueError):
             pass
@@ -74,5 +122,23 @@ def write_config_file(file_name: str, camera_info: dict):
         else:
             default_value = param_info[cn.DEFAULT]
         parser["DEFAULT_VALUES"][param.name] = str(default_value)
-    with open(file_name, "w") as file:
-        parser.write(file)
+    buffer = io.StringIO()
+    parser.write(buffer)
+    content = buffer.getvalue()
+    # File is not rewritten if it has the same contents and has not been changed
+    # by anyone else since it was written
+    written = _WRITTEN_CONFIGS.get(file_name)
+    if written is not None and written[1] == content:
+        try:
+            stat = os.stat(file_name)
+        except OSError:
+            stat = None
+        if stat is not None and written[0] == (stat.st_mtime_ns, stat.st_size):
+            return
+    # File is replaced at once, so it is not left partially written
+    temp_file_name = file_name + ".tmp"
+    with open(temp_file_name, "w") as file:
+        file.write(content)
+    os.replace(temp_file_name, file_name)
+    stat = os.stat(file_name)
+    _WRITTEN_CONFIGS[file_name] = (stat.st_mtime_ns, stat.st_size), content
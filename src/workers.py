@@ -0,0 +1,44 @@
+"""
+File with workers to run blocking operations with camera in thread pool.
+"""
+
+from PyQt5.QtCore import pyqtSignal, QObject, QRunnable
+from vac248ip import Vac248IpCamera
+
+
+class OpenDeviceSignals(QObject):
+    """
+    Class with signals of worker that opens camera. QRunnable is not QObject and
+    cannot have own signals.
+    """
+
+    finished: pyqtSignal = pyqtSignal(object, bool, str)
+
+
+class OpenDeviceWorker(QRunnable):
+    """
+    Class for worker that opens camera.
+    """
+
+    def __init__(self, camera: Vac248IpCamera, attempts: int = 1):
+        """
+        :param camera: camera to be opened;
+        :param attempts: number of attempts to open camera.
+        """
+
+        super().__init__()
+        self._attempts: int = attempts
+        self._camera: Vac248IpCamera = camera
+        self.signals: OpenDeviceSignals = OpenDeviceSignals()
+
+    def run(self):
+        """
+        Method opens camera and emits signal with camera and result.
+        """
+
+        try:
+            self._camera.open_device(self._attempts)
+        except Exception as exc:
+            self.signals.finished.emit(self._camera, False, str(exc))
+            return
+        self.signals.finished.emit(self._camera, True, "")
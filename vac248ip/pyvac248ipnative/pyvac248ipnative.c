@@ -1,3 +1,7 @@
+#ifdef __linux__
+#   define _GNU_SOURCE  // recvmmsg()
+#endif
+
 #include "pyvac248ipnative.h"
 
 #include <stddef.h>
@@ -15,6 +19,15 @@
 
 #define PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_ 1472
 #define PYVAC248IPNATIVE_IMPL_CONFIG_PACKET_SIZE_ 48
+// Max count of packets received by one recvmmsg() call
+#define PYVAC248IPNATIVE_IMPL_RECV_BATCH_SIZE_ 64
+
+
+// Results of packet check
+#define PYVAC248IPNATIVE_IMPL_PACKET_ACCEPT_ 0
+#define PYVAC248IPNATIVE_IMPL_PACKET_SKIP_ 1
+#define PYVAC248IPNATIVE_IMPL_PACKET_LAST_FRAME_DONE_ 2
+#define PYVAC248IPNATIVE_IMPL_PACKET_TOO_MANY_INCORRECT_ 3
 
 
 #define pyvac248ipnative_impl_send_command_start_(socket_fd, camera_ip, camera_port, format, send_command_delay_ms) \
@@ -41,6 +54,21 @@ pyvac248ipnative_impl_send_command_(
 );
 
 
+static
+int
+pyvac248ipnative_impl_check_packet_(
+        const unsigned char *packet,
+        ssize_t packet_length,
+        const struct sockaddr_in *src_sockaddr,
+        uint32_t camera_ip,
+        int frames,
+        int frame_packets,
+        int max_incorrect_length_packets,
+        int *incorrect_packets_length,
+        unsigned char *packet_type
+);
+
+
 static
 int
 pyvac248ipnative_impl_drop_packets_(
@@ -91,7 +119,8 @@ pyvac248ipnative_get_version(
 PYVAC248IPNATIVE_API
 int
 pyvac248ipnative_capture_packets(
-        void *dst,
+        void *dst_types,
+        void *dst_payloads,
         int dst_size,
         int *packets_received,
 
@@ -115,19 +144,28 @@ pyvac248ipnative_capture_packets(
         packets_received_ = 0,
         incorrect_packets_length = 0;
 
-    unsigned char * const dst_casted = (unsigned char *)dst;
+    unsigned char * const types = (unsigned char *)dst_types;
+    unsigned char * const payloads = (unsigned char *)dst_payloads;
     unsigned char *packet_buffer;
-    int packet_buffer_offset;
-
-    int frame_number;
-    int packet_offset;
+    unsigned char packet_type;
+    int check_res;
+    int collecting = 1;
 
     struct pollfd poll_fd = { .fd = socket_fd, .events = POLLIN | POLLERR, .revents = 0 };
     int poll_res;
 
+#ifdef __linux__
+    // Packets are received directly into successive rows of payloads buffer
+    struct mmsghdr messages[PYVAC248IPNATIVE_IMPL_RECV_BATCH_SIZE_];
+    struct iovec iovecs[PYVAC248IPNATIVE_IMPL_RECV_BATCH_SIZE_];
+    struct sockaddr_in src_sockaddrs[PYVAC248IPNATIVE_IMPL_RECV_BATCH_SIZE_];
+    int batch_size, i;
+    int recvmmsg_res;
+#else
     struct sockaddr_in src_sockaddr;
     socklen_t src_sockaddr_len;
     ssize_t recvfrom_res;
+#endif
 
     int fcntl_res_before, fcntl_res_required;
 
@@ -147,9 +185,7 @@ pyvac248ipnative_capture_packets(
     }
 
     // Set default packet type to 0 (data packet)
-    for (unsigned char *p = dst_casted; p < dst_casted + dst_size; p += PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_ + 1) {
-        *p = 0;
-    }
+    memset(types, 0, (size_t)dst_size);
 
     // Start video stream
     pyvac248ipnative_impl_send_command_stop_(socket_fd, camera_ip, camera_port, send_command_delay_ms);
@@ -165,10 +201,7 @@ pyvac248ipnative_capture_packets(
      */
     pyvac248ipnative_impl_send_command_exposure_(socket_fd, camera_ip, camera_port, exposure, send_command_delay_ms);
 
-    while (packets_received_ < dst_size) {
-        packet_buffer_offset = packets_received_ * (PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_ + 1);
-        packet_buffer = dst_casted + packet_buffer_offset + 1;
-
+    while (collecting && packets_received_ < dst_size) {
         poll_fd.revents = 0;
         poll_res = poll(&poll_fd, 1, network_operation_timeout_ms);
         if (poll_res == 1) {
@@ -184,66 +217,91 @@ pyvac248ipnative_capture_packets(
             break;
         }
 
-        recvfrom_res = recvfrom(
-                socket_fd,
-                packet_buffer, PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_, 0,
-                (struct sockaddr *)&src_sockaddr, &src_sockaddr_len
-        );
+#ifdef __linux__
+        batch_size = dst_size - packets_received_;
+        if (batch_size > PYVAC248IPNATIVE_IMPL_RECV_BATCH_SIZE_) {
+            batch_size = PYVAC248IPNATIVE_IMPL_RECV_BATCH_SIZE_;
+        }
+        memset(messages, 0, sizeof(messages[0]) * (size_t)batch_size);
+        for (i = 0; i < batch_size; ++i) {
+            iovecs[i].iov_base = payloads + (size_t)(packets_received_ + i) * PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_;
+            iovecs[i].iov_len = PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_;
+            messages[i].msg_hdr.msg_name = &src_sockaddrs[i];
+            messages[i].msg_hdr.msg_namelen = sizeof(src_sockaddrs[i]);
+            messages[i].msg_hdr.msg_iov = &iovecs[i];
+            messages[i].msg_hdr.msg_iovlen = 1;
+        }
 
-        if (recvfrom_res < 0) {
+        // Socket is non-blocking, so all packets ready at the moment (but no more than batch) are received
+        recvmmsg_res = recvmmsg(socket_fd, messages, (unsigned int)batch_size, 0, NULL);
+        if (recvmmsg_res < 0) {
             // Any error occurred, see errno
             result = -1;
             errno_ = errno;
             break;
         }
 
-        if (recvfrom_res == PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_) {
-            // Check camera ip
-            if (src_sockaddr.sin_addr.s_addr != camera_ip) {
-                continue;
-            }
-
-            // Data packet received
-            // [frame number (bytes: 0) | pix number (bytes: 1 hi, 2, 3 low) | pixel data (bytes: [4...1472))]
-
-            incorrect_packets_length = 0;
-
-            frame_number = packet_buffer[0];
-            packet_offset = (((int)packet_buffer[1]) << 16) | (((int)packet_buffer[2]) << 8) | (int)packet_buffer[3];
-
-            if (
-                    frame_number == 0 ||
-                    packet_offset > (PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_ - 4) * (frame_packets - 1) ||
-                    packet_offset % (PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_ - 4) != 0
-            ) {
-                // Skip the first frame, which can be overexposed
-                // Filter incorrect offsets (assuming c-version is fast enough to do simple additional filtering online)
-                continue;
-            } else if (frame_number > frames) {
+        for (i = 0; i < recvmmsg_res; ++i) {
+            check_res = pyvac248ipnative_impl_check_packet_(
+                    (const unsigned char *)iovecs[i].iov_base, (ssize_t)messages[i].msg_len, &src_sockaddrs[i],
+                    camera_ip, frames, frame_packets, max_incorrect_length_packets, &incorrect_packets_length,
+                    &packet_type
+            );
+
+            if (check_res == PYVAC248IPNATIVE_IMPL_PACKET_ACCEPT_) {
+                // Skipped packets leave gaps in batch, move accepted packet to the first free row
+                packet_buffer = payloads + (size_t)packets_received_ * PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_;
+                if (packet_buffer != iovecs[i].iov_base) {
+                    memmove(packet_buffer, iovecs[i].iov_base, messages[i].msg_len);
+                }
+                types[packets_received_] = packet_type;
+                ++packets_received_;
+            } else if (check_res == PYVAC248IPNATIVE_IMPL_PACKET_LAST_FRAME_DONE_) {
                 // All required frames received, stop packets collecting algorithm
                 result = 0;
+                collecting = 0;
                 break;
-            }
-        } else if (recvfrom_res == PYVAC248IPNATIVE_IMPL_CONFIG_PACKET_SIZE_) {
-            // Check camera ip
-            if (src_sockaddr.sin_addr.s_addr != camera_ip) {
-                continue;
-            }
-
-            // Config packet received
-            dst_casted[packet_buffer_offset] = 1;
-            incorrect_packets_length = 0;
-        } else {
-            ++incorrect_packets_length;
-            if (incorrect_packets_length > max_incorrect_length_packets) {
+            } else if (check_res == PYVAC248IPNATIVE_IMPL_PACKET_TOO_MANY_INCORRECT_) {
                 result = 2;
+                collecting = 0;
                 break;
-            } else {
-                continue;
             }
         }
+#else
+        packet_buffer = payloads + (size_t)packets_received_ * PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_;
+
+        src_sockaddr_len = sizeof(src_sockaddr);
+        recvfrom_res = recvfrom(
+                socket_fd,
+                packet_buffer, PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_, 0,
+                (struct sockaddr *)&src_sockaddr, &src_sockaddr_len
+        );
+
+        if (recvfrom_res < 0) {
+            // Any error occurred, see errno
+            result = -1;
+            errno_ = errno;
+            break;
+        }
+
+        check_res = pyvac248ipnative_impl_check_packet_(
+                packet_buffer, recvfrom_res, &src_sockaddr,
+                camera_ip, frames, frame_packets, max_incorrect_length_packets, &incorrect_packets_length,
+                &packet_type
+        );
 
-        ++packets_received_;
+        if (check_res == PYVAC248IPNATIVE_IMPL_PACKET_ACCEPT_) {
+            types[packets_received_] = packet_type;
+            ++packets_received_;
+        } else if (check_res == PYVAC248IPNATIVE_IMPL_PACKET_LAST_FRAME_DONE_) {
+            // All required frames received, stop packets collecting algorithm
+            result = 0;
+            break;
+        } else if (check_res == PYVAC248IPNATIVE_IMPL_PACKET_TOO_MANY_INCORRECT_) {
+            result = 2;
+            break;
+        }
+#endif
     }
 
     // Stop video translation
@@ -311,6 +369,71 @@ pyvac248ipnative_impl_send_command_(
 }
 
 
+static
+int
+pyvac248ipnative_impl_check_packet_(
+        const unsigned char *packet,
+        ssize_t packet_length,
+        const struct sockaddr_in *src_sockaddr,
+        uint32_t camera_ip,
+        int frames,
+        int frame_packets,
+        int max_incorrect_length_packets,
+        int *incorrect_packets_length,
+        unsigned char *packet_type
+)
+{
+    int frame_number;
+    int packet_offset;
+
+    if (packet_length == PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_) {
+        // Check camera ip
+        if (src_sockaddr->sin_addr.s_addr != camera_ip) {
+            return PYVAC248IPNATIVE_IMPL_PACKET_SKIP_;
+        }
+
+        // Data packet received
+        // [frame number (bytes: 0) | pix number (bytes: 1 hi, 2, 3 low) | pixel data (bytes: [4...1472))]
+
+        *incorrect_packets_length = 0;
+
+        frame_number = packet[0];
+        packet_offset = (((int)packet[1]) << 16) | (((int)packet[2]) << 8) | (int)packet[3];
+
+        if (
+                frame_number == 0 ||
+                packet_offset > (PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_ - 4) * (frame_packets - 1) ||
+                packet_offset % (PYVAC248IPNATIVE_IMPL_DATA_PACKET_SIZE_ - 4) != 0
+        ) {
+            // Skip the first frame, which can be overexposed
+            // Filter incorrect offsets (assuming c-version is fast enough to do simple additional filtering online)
+            return PYVAC248IPNATIVE_IMPL_PACKET_SKIP_;
+        } else if (frame_number > frames) {
+            return PYVAC248IPNATIVE_IMPL_PACKET_LAST_FRAME_DONE_;
+        }
+
+        *packet_type = 0;
+        return PYVAC248IPNATIVE_IMPL_PACKET_ACCEPT_;
+    } else if (packet_length == PYVAC248IPNATIVE_IMPL_CONFIG_PACKET_SIZE_) {
+        // Check camera ip
+        if (src_sockaddr->sin_addr.s_addr != camera_ip) {
+            return PYVAC248IPNATIVE_IMPL_PACKET_SKIP_;
+        }
+
+        // Config packet received
+        *incorrect_packets_length = 0;
+        *packet_type = 1;
+        return PYVAC248IPNATIVE_IMPL_PACKET_ACCEPT_;
+    }
+
+    ++*incorrect_packets_length;
+    if (*incorrect_packets_length > max_incorrect_length_packets) {
+        return PYVAC248IPNATIVE_IMPL_PACKET_TOO_MANY_INCORRECT_;
+    }
+    return PYVAC248IPNATIVE_IMPL_PACKET_SKIP_;
+}
+
+
 static
 int
 pyvac248ipnative_impl_drop_packets_(
@@ -4,8 +4,8 @@
 #include <stdint.h>
 
 
-#define PYVAC248IPNATIVE_VERSION_MAJOR 1
-#define PYVAC248IPNATIVE_VERSION_MINOR 0
+#define PYVAC248IPNATIVE_VERSION_MAJOR 2
+#define PYVAC248IPNATIVE_VERSION_MINOR 1
 #define PYVAC248IPNATIVE_VERSION_BUGFIX 0
 
 
@@ -29,7 +29,8 @@ pyvac248ipnative_get_version(
 PYVAC248IPNATIVE_API
 int
 pyvac248ipnative_capture_packets(
-        void *dst,
+        void *dst_types,
+        void *dst_payloads,
         int dst_size,
         int *packets_received,
 
@@ -5,13 +5,17 @@ File with useful functions.
 import functools
 import io
 import os
+import re
+import threading
 from typing import Callable, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 import numpy as np
-from PIL import Image
 
 
 vac248ip_default_port = 1024  # default port
+_encoding_buffers = threading.local()  # buffers to encode images, one per thread
+_IMAGE_EXTENSIONS = frozenset((".bmp", ".jpg", ".png"))
+_SIMPLE_ADDRESS_RE = re.compile(r"^([^:@/?#\[\]\\\s]+)(?::([0-9]*))?$")  # 'host' or 'host:port'
 
 
 def _check_image_file(file_name: str) -> bool:
@@ -21,10 +25,7 @@ def _check_image_file(file_name: str) -> bool:
     :return: True if file is image file.
     """
 
-    extensions = ".bmp", ".jpg", ".png"
-    if os.path.exists(file_name) and os.path.isfile(file_name) and os.path.splitext(file_name)[1].lower() in extensions:
-        return True
-    return False
+    return os.path.splitext(file_name)[1].lower() in _IMAGE_EXTENSIONS and os.path.isfile(file_name)
 
 
 def _create_image(width: int, height: int, amplitude: int) -> np.ndarray:
@@ -36,13 +37,46 @@ def _create_image(width: int, height: int, amplitude: int) -> np.ndarray:
     """
 
     length = width / 10
-    pixels = np.zeros(width * height, dtype=np.uint8)
-    pixels = pixels.reshape(height, width)
-    for y in range(height):
-        for x in range(width):
-            r = np.sqrt((x - width / 2) ** 2 + (y - height / 2) ** 2)
-            pixels[y][x] = int(amplitude * (1 + np.sin(2 * np.pi * r / length)))
-    return pixels
+    y, x = np.ogrid[:height, :width]
+    r = np.sqrt((x - width / 2) ** 2 + (y - height / 2) ** 2)
+    return (amplitude * (1 + np.sin(2 * np.pi * r / length))).astype(np.uint8)
+
+
+def _compute_exposure_in_ms_960x600(exposure: int) -> float:
+    """
+    Function computes exposure value in ms for image format 960x600.
+    :param exposure: exposure.
+    :return: exposure in ms.
+    """
+
+    if 1 <= exposure <= 50:
+        return exposure * 1 * 0.100
+    if 51 <= exposure <= 100:
+        return 50 * 1 * 0.100 + exposure * 2 * 0.100
+    if exposure <= 190:
+        return 50 * 1 * 0.100 + 50 * 2 * 0.100 + (exposure - 100) * 5 * 0.100
+    return 0.0
+
+
+def _compute_exposure_in_ms_1920x1200(exposure: int) -> float:
+    """
+    Function computes exposure value in ms for image format 1920x1200.
+    :param exposure: exposure.
+    :return: exposure in ms.
+    """
+
+    if exposure <= 50:
+        return exposure * 2 * 0.1833
+    if 51 <= exposure <= 100:
+        return 50 * 2 * 0.1833 + (exposure - 50) * 4 * 0.1833
+    if exposure <= 190:
+        return 50 * 2 * 0.1833 + 50 * 4 * 0.1833 + (exposure - 100) * 10 * 0.1833
+    return 0.0
+
+
+# Exposures in ms for all values of exposure that can be set to camera
+_EXPOSURE_IN_MS_960x600 = {exposure: _compute_exposure_in_ms_960x600(exposure) for exposure in range(1, 191)}
+_EXPOSURE_IN_MS_1920x1200 = {exposure: _compute_exposure_in_ms_1920x1200(exposure) for exposure in range(1, 191)}
 
 
 def check_open(func: Callable) -> Callable:
@@ -68,11 +102,7 @@ def clip(value: Union[int, float], min_value: Union[int, float], max_value: Unio
     :return: available value.
     """
 
-    if value < min_value:
-        return min_value
-    if max_value < value:
-        return max_value
-    return value
+    return min(max_value, max(min_value, value))
 
 
 def convert_exposure_to_ms_960x600(exposure: int) -> float:
@@ -82,13 +112,10 @@ def convert_exposure_to_ms_960x600(exposure: int) -> float:
     :return: exposure in ms.
     """
 
-    if 1 <= exposure <= 50:
-        return exposure * 1 * 0.100
-    if 51 <= exposure <= 100:
-        return 50 * 1 * 0.100 + exposure * 2 * 0.100
-    if exposure <= 190:
-        return 50 * 1 * 0.100 + 50 * 2 * 0.100 + (exposure - 100) * 5 * 0.100
-    return 0.0
+    exposure_in_ms = _EXPOSURE_IN_MS_960x600.get(exposure)
+    if exposure_in_ms is None:
+        exposure_in_ms = _compute_exposure_in_ms_960x600(exposure)
+    return exposure_in_ms
 
 
 def convert_exposure_to_ms_1920x1200(exposure: int) -> float:
@@ -98,13 +125,10 @@ def convert_exposure_to_ms_1920x1200(exposure: int) -> float:
     :return: exposure in ms.
     """
 
-    if exposure <= 50:
-        return exposure * 2 * 0.1833
-    if 51 <= exposure <= 100:
-        return 50 * 2 * 0.1833 + (exposure - 50) * 4 * 0.1833
-    if exposure <= 190:
-        return 50 * 2 * 0.1833 + 50 * 4 * 0.1833 + (exposure - 100) * 10 * 0.1833
-    return 0.0
+    exposure_in_ms = _EXPOSURE_IN_MS_1920x1200.get(exposure)
+    if exposure_in_ms is None:
+        exposure_in_ms = _compute_exposure_in_ms_1920x1200(exposure)
+    return exposure_in_ms
 
 
 def create_image_files_list(image_files: List[str], image_dir: str) -> List[str]:
@@ -127,10 +151,11 @@ def create_image_files_list(image_files: List[str], image_dir: str) -> List[str]
         if not os.path.exists(image_dir):
             print("Warning! Directory '{}' was not found and will not be used".format(image_dir))
         else:
-            for file in os.listdir(image_dir):
-                file = os.path.join(image_dir, file)
-                if _check_image_file(file):
-                    full_image_files.append(file)
+            # Entries of directory know their type, so files are not checked with extra system calls
+            with os.scandir(image_dir) as entries:
+                for entry in entries:
+                    if os.path.splitext(entry.name)[1].lower() in _IMAGE_EXTENSIONS and entry.is_file():
+                        full_image_files.append(os.path.join(image_dir, entry.name))
     return full_image_files
 
 
@@ -140,6 +165,8 @@ def create_images(dir_name: str) -> None:
     :param dir_name: name of directory where images will be saved.
     """
 
+    from PIL import Image
+
     sizes = (960, 600), (1920, 1200)
     amplitudes = 255 / 10, 255 / 5, 255 / 2
     for width, height in sizes:
@@ -159,19 +186,29 @@ def encode_bitmap(frame: np.ndarray, image_format: str = "bmp") -> bytes:
     :return: image data.
     """
 
+    from PIL import Image
+
     image = Image.fromarray(frame)
-    del frame
-    b = io.BytesIO()
-    image.save(b, image_format)
-    del image
+    b = getattr(_encoding_buffers, "buffer", None)
+    if b is None:
+        b = _encoding_buffers.buffer = io.BytesIO()
+    b.seek(0)
+    b.truncate()
+    # Fast compression for PNG, images are encoded for every frame
+    options = {"compress_level": 1} if image_format.lower() == "png" else {}
+    image.save(b, image_format, **options)
     return b.getvalue()
 
 
 def for_all_methods(decorator):
     def decorate(cls):
-        for attr in cls.__bases__[0].__dict__:
-            if callable(getattr(cls, attr)) and not attr.startswith("_") and attr != "open_device":
-                setattr(cls, attr, decorator(getattr(cls, attr)))
+        for attr, value in tuple(cls.__bases__[0].__dict__.items()):
+            if attr.startswith("_") or attr == "open_device":
+                continue
+            # Method overridden in decorated class is decorated instead of method of base class
+            value = cls.__dict__.get(attr, value)
+            if callable(value):
+                setattr(cls, attr, decorator(value))
         return cls
     return decorate
 
@@ -185,6 +222,16 @@ def get_host_and_port(address: Union[str, Tuple[str, int]]) -> Tuple[str, int]:
     """
 
     if isinstance(address, str):
+        match = _SIMPLE_ADDRESS_RE.match(address)
+        if match:
+            # Simple address is parsed without URL parser, result is the same
+            host, port = match.groups()
+            if not port:
+                return host.lower(), vac248ip_default_port
+            port = int(port)
+            if not 0 <= port <= 65535:
+                raise ValueError("Port out of range 0-65535")
+            return host.lower(), port
         parsed_address = urlparse("http://{}".format(address))
         port = parsed_address.port if parsed_address.port is not None else vac248ip_default_port
         return parsed_address.hostname, port
@@ -203,13 +250,14 @@ def open_image(file_name: str, width: int, height: int) -> Optional[np.ndarray]:
     :return: array of pixels.
     """
 
+    from PIL import Image
+
     image = Image.open(file_name)
     image_width, image_height = image.size
     if image_width != width or image_height != height:
         return None
-    pixels = np.array(image)
-    pixels_array = pixels.ravel()
-    return pixels_array
+    # Array is read-only view of image data, so data is not copied once more
+    return np.asarray(image).reshape(-1)
 
 
 if __name__ == "__main__":
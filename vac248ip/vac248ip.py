@@ -3,7 +3,9 @@ File with class for real vac248ip camera.
 """
 
 import argparse
+import concurrent.futures
 import ctypes
+import functools
 import logging
 import socket
 import struct
@@ -17,7 +19,21 @@ from .vac248ip_base import (Vac248IpCameraBase, Vac248IpGamma, Vac248IpShutter,
 
 __all__ = ["vac248ip_allow_native_library", "vac248ip_deny_native_library", "vac248ip_main", "Vac248IpCamera"]
 _VAC248IP_CAMERA_DATA_PACKET_SIZE = 1472
+# Size of frame data in data packet, 4 bytes are taken by header
+_VAC248IP_CAMERA_FRAME_DATA_SIZE = _VAC248IP_CAMERA_DATA_PACKET_SIZE - 4
+# With MSG_TRUNC real length of datagram is returned even if it does not fit into
+# buffer, so bigger packets are not taken for packets of expected size
+_RECV_FLAGS = getattr(socket, "MSG_TRUNC", 0)
+# Major version of native library with the same ABI of capture function
+_NATIVE_LIBRARY_VERSION_MAJOR = 2
 _vac248ip_native_library_allowed = None
+# (data_packets, frame_size, buffer_packets), frame buffers are split into rows of packet
+# size (buffer_packets rows), last packet can be partial
+_vac248ip_frame_layout_by_format = {
+    video_format: (data_packets, width * height * bytes_per_pixel,
+                   max(data_packets, -(-width * height * bytes_per_pixel // _VAC248IP_CAMERA_FRAME_DATA_SIZE)))
+    for video_format, (width, height, data_packets, bytes_per_pixel) in vac248ip_frame_parameters_by_format.items()
+}
 
 
 def vac248ip_allow_native_library() -> None:
@@ -42,6 +58,60 @@ def vac248ip_deny_native_library() -> None:
         _vac248ip_native_library_allowed = False
 
 
+@functools.lru_cache(maxsize=None)
+def _get_command_packet(command: int, data: int) -> bytes:
+    """
+    Function returns packet with command for camera. Packets are cached, there are
+    few different commands.
+    :param command: command code;
+    :param data: data for command.
+    :return: packet with command.
+    """
+
+    return bytes((command & 0xff, data & 0xff, 0, 0, 0, 0, 0, (command + data) & 0xff))
+
+
+def _get_last_occurrences(keys: np.ndarray) -> np.ndarray:
+    """
+    Function returns indices of last occurrences of unique keys in array.
+    :param keys: array with keys.
+    :return: array with indices.
+    """
+
+    _, reversed_indices = np.unique(keys[::-1], return_index=True)
+    return len(keys) - 1 - reversed_indices
+
+
+def _parse_packets(types: np.ndarray, payloads: np.ndarray, frame_packets: int
+                   ) -> Tuple[Optional[bytes], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Function parses all received packets at once.
+    :param types: types of packets (0 - data packet, 1 - config packet);
+    :param payloads: data of packets, one packet in row;
+    :param frame_packets: number of data packets in frame.
+    :return: (data of last config packet or None, rows of data packets with correct
+    offsets, frame numbers of these packets, indices of these packets in frame).
+    """
+
+    is_config = types == 1
+    config_rows = np.flatnonzero(is_config)
+    config_data = None
+    if len(config_rows):
+        config_data = payloads[config_rows[-1], :_Vac248IpCameraConfig.PACKET_LENGTH].tobytes()
+
+    # Packet: [frame number (bytes: 0) | pix number (bytes: 1 hi, 2, 3 low) |
+    # pixel data (bytes: [4...1472))]
+    data_rows = np.flatnonzero(~is_config)
+    # Header is read as big-endian number: frame number in high byte, offset in low bytes
+    headers = payloads[data_rows, :4].view(">u4")[:, 0].astype(np.int64)
+    offsets = headers & 0xffffff
+
+    # Filter incorrect offsets
+    default_frame_data_size = _VAC248IP_CAMERA_FRAME_DATA_SIZE
+    correct = (offsets <= default_frame_data_size * (frame_packets - 1)) & (offsets % default_frame_data_size == 0)
+    return config_data, data_rows[correct], headers[correct] >> 24, offsets[correct] // default_frame_data_size
+
+
 class Vac248IpCamera(Vac248IpCameraBase):
     """
     Vac248IP camera handler.
@@ -60,7 +130,8 @@ class Vac248IpCamera(Vac248IpCameraBase):
                  video_format: Vac248IpVideoFormat = Vac248IpVideoFormat.FORMAT_1920x1200, num_frames: int = 1,
                  open_attempts: Optional[int] = 10, default_attempts: Optional[int] = None, defer_open: bool = False,
                  frame_number_module: int = 1000000, network_operation_timeout: Union[None, int, float] = 1,
-                 udp_redundant_coeff: Union[int, float] = 1.5, allow_native_library: Optional[bool] = None) -> None:
+                 udp_redundant_coeff: Union[int, float] = 1.5, allow_native_library: Optional[bool] = None,
+                 receive_buffer_size: Optional[int] = 8 * 1024 * 1024) -> None:
         """
         Vac248IpCamera constructor.
         :param address: string with camera address (maybe, trailing with ":<port>",
@@ -79,9 +150,21 @@ class Vac248IpCamera(Vac248IpCameraBase):
         :param udp_redundant_coeff: expected average UDP packet count divided by unique packets
         (your network generates ~20 duplicates => give value >= 1.2);
         :param allow_native_library: allow this library try to load native extension (if available)
-        for speed up some operations for you.
+        for speed up some operations for you;
+        :param receive_buffer_size: size of socket receive buffer in bytes (system can limit it),
+        None to keep system default.
         """
 
+        self._receive_buffer_size: Optional[int] = receive_buffer_size
+        # Last applied config packet, the same packet is not parsed again
+        self._last_config_data: bytes = b""
+        # Time (by time.monotonic()) when next command can be sent to camera
+        self._next_command_time: float = 0.0
+        # Buffer for dropped packets, its content is never used
+        self._drop_buffer: bytearray = bytearray(_VAC248IP_CAMERA_DATA_PACKET_SIZE)
+        # Buffers for received packets are reused for all captures, they only grow
+        self._packet_payloads: np.ndarray = np.empty((0, _VAC248IP_CAMERA_DATA_PACKET_SIZE), dtype=np.uint8)
+        self._packet_types: np.ndarray = np.empty(0, dtype=np.uint8)
         super().__init__(address, *args, video_format=video_format, num_frames=num_frames, open_attempts=open_attempts,
                          default_attempts=default_attempts, defer_open=defer_open,
                          frame_number_module=frame_number_module, network_operation_timeout=network_operation_timeout,
@@ -99,6 +182,10 @@ class Vac248IpCamera(Vac248IpCameraBase):
             self.open_device(attempts=open_attempts)
 
     def _apply_config(self, config_buffer: Union[ByteString, np.ndarray, memoryview]) -> None:
+        config_data = bytes(config_buffer)
+        if not self._need_update_config and config_data == self._last_config_data:
+            # Camera config is not changed and parameters were not changed locally
+            return
         config = _Vac248IpCameraConfig(config_buffer)
         self._shutter = config.shutter
         self._gamma = config.gamma_correction
@@ -114,51 +201,50 @@ class Vac248IpCamera(Vac248IpCameraBase):
         # For version-specific functionality, camera class should contain
         # version information
         self._camera_id = config.camera_id
+        self._last_config_data = config_data
 
     def _update_config(self, force: bool = False) -> None:
         if self._need_update_config or force:
             self._send_command_stop()
             self._drop_received_packets()
             self._send_command(0xf2)
-            # Receive packet dropping other
+            # Receive packet dropping other. Socket is connected to camera, so
+            # packets from other addresses are not received
             camera_socket = self._socket
-            camera_address = self._camera_host
             packet_buffer = np.empty(_Vac248IpCameraConfig.PACKET_LENGTH, dtype=np.uint8)
             packet_length = _Vac248IpCameraConfig.PACKET_LENGTH
             while True:
-                # If data packets for the current camera are bigger than config
-                # packets, an error can occur when reading into the smaller
-                # buffer
+                # Data packets are bigger than config packets, with MSG_TRUNC
+                # they are not truncated into false config packets
                 try:
-                    result_length, address = camera_socket.recvfrom_into(packet_buffer, packet_length)
+                    result_length = camera_socket.recv_into(packet_buffer, packet_length, _RECV_FLAGS)
                 except OSError as e:
                     self.logger.debug("While awaiting configuration packet, "
                                       "error occurred: {}".format(e))
                     continue
-                if result_length == packet_length and address[0] == camera_address:
+                if result_length == packet_length:
                     break
             self._apply_config(packet_buffer)
 
-    def _capture_packets_native(self, frames: int = 1) -> Tuple[memoryview, int]:
+    def _capture_packets_native(self, frames: int = 1) -> Tuple[np.ndarray, np.ndarray, int]:
         """
         Captures packets required for building 'frames' frames.
-        Returned buffer has structure:
-            [type (1-byte) | data (1472 bytes)] ... [...]
-            | <-              N chunks               -> |
+        Returned buffers have structure:
+            types: [type (1 byte)] x N,
+            payloads: [data (1472 bytes)] x N,
             Where N = int(frames * (frame_packets + 1) * udp_redundant_coeff),
             type == 0 means data packet, type == 1 means config packet.
         :param frames: count of frames to be built.
-        :return: (memory view to buffer, received packets).
+        :return: (types of packets, data of packets, received packets).
         """
 
-        _, _, frame_packets, _ = vac248ip_frame_parameters_by_format[self._video_format]
+        frame_packets, _, _ = _vac248ip_frame_layout_by_format[self._video_format]
 
         # Frames data packets + at max 1 settings data packet (index to it saved to
         # settings_packet_index)
         packet_buffers_count = int(frames * (1 + frame_packets) * self._udp_redundant_coeff)
-        packet_buffers = np.empty(packet_buffers_count * (_VAC248IP_CAMERA_DATA_PACKET_SIZE + 1),
-                                  dtype=np.uint8)
-        packet_buffers[::_VAC248IP_CAMERA_DATA_PACKET_SIZE + 1] = 0  # Default type = 0
+        # Native library sets default type = 0 itself
+        types, payloads = self._get_packet_buffers(packet_buffers_count)
 
         # Total count of received packets
         packets_received = ctypes.c_int(0)
@@ -166,8 +252,9 @@ class Vac248IpCamera(Vac248IpCameraBase):
         camera_ip, camera_port = self._socket.getpeername()
 
         res = self._capture_packets_native_fn(
-            packet_buffers.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8)),  # dst
-            packet_buffers.shape[0],  # dst_size
+            types.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8)),  # dst_types
+            payloads.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8)),  # dst_payloads
+            packet_buffers_count,  # dst_size
             ctypes.byref(packets_received),  # packets_received
             self._socket.fileno(),  # socket_fd
             frames,  # frames
@@ -200,39 +287,48 @@ class Vac248IpCamera(Vac248IpCameraBase):
 
         packets_received = packets_received.value
         self.logger.debug("Received %s packet(s).", packets_received)
-        return (memoryview(packet_buffers)[:packets_received * (_VAC248IP_CAMERA_DATA_PACKET_SIZE + 1)],
-                packets_received)
+        return types[:packets_received], payloads[:packets_received], packets_received
 
-    def _capture_packets_universal(self, frames: int = 1) -> Tuple[memoryview, int]:
+    def _capture_packets_universal(self, frames: int = 1) -> Tuple[np.ndarray, np.ndarray, int]:
         """
         Captures packets required for building 'frames' frames.
-        Returned buffer has structure:
-            [type (1-byte) | data (1472 bytes)] ... [...]
-            | <-              N chunks               -> |
+        Returned buffers have structure:
+            types: [type (1 byte)] x N,
+            payloads: [data (1472 bytes)] x N,
             Where N = int(frames * (frame_packets + 1) * udp_redundant_coeff),
             type == 0 means data packet, type == 1 means config packet.
         :param frames: count of frames to be built.
-        :return: (memory view to buffer, received packets).
+        :return: (types of packets, data of packets, received packets).
         """
 
-        _, _, frame_packets, _ = vac248ip_frame_parameters_by_format[self._video_format]
+        frame_packets, _, _ = _vac248ip_frame_layout_by_format[self._video_format]
 
         data_packet_size = _VAC248IP_CAMERA_DATA_PACKET_SIZE
         config_packet_size = _Vac248IpCameraConfig.PACKET_LENGTH
 
+        # Socket is connected to camera, so packets from other addresses are not received
         camera_socket = self._socket
-        camera_address = self._camera_host
 
         # Frames data packets + at max 1 settings data packet (index to it saved to
         # settings_packet_index)
         packet_buffers_count = int(frames * (1 + frame_packets) * self._udp_redundant_coeff)
-        packet_buffers = np.empty(packet_buffers_count * (data_packet_size + 1), dtype=np.uint8)
-        packet_buffers[::data_packet_size + 1] = 0  # Default type = 0 (data packet)
-        packet_buffers_mv = memoryview(packet_buffers)
+        types, payloads = self._get_packet_buffers(packet_buffers_count)
+        # Buffers are reused, default packet type = 0 (data packet) is set for all packets
+        # at once, type of rare config packets is set in loop
+        types.fill(0)
+        types_mv = memoryview(types)
+        payloads_mv = memoryview(payloads.reshape(-1))
 
         # Total count of received packets
         packets_received = 0
 
+        # Map of received data packets of all frames, so that receiving can be stopped
+        # as soon as all frames are complete
+        default_frame_data_size = _VAC248IP_CAMERA_FRAME_DATA_SIZE
+        packets_seen = bytearray(frames * frame_packets)
+        unique_packets_required = len(packets_seen)
+        unique_packets_received = 0
+
         incorrect_length_packets = 0
         max_incorrect_length_packets = 100
 
@@ -251,26 +347,19 @@ class Vac248IpCamera(Vac248IpCameraBase):
         # Receive packets
         while packets_received < packet_buffers_count:
             # Buffer for current packet
-            packet_offset = packets_received * (data_packet_size + 1)
-            packet_buffer = packet_buffers_mv[packet_offset + 1: packet_offset + 1 + data_packet_size]
+            packet_offset = packets_received * data_packet_size
+            packet_buffer = payloads_mv[packet_offset: packet_offset + data_packet_size]
 
-            # Receive data or settings packet dropping other
-            try:
-                result_length, address = camera_socket.recvfrom_into(packet_buffer)
-            except ValueError:
-                # Received > _VAC248IP_CAMERA_DATA_PACKET_SIZE bytes
-                continue
+            # Receive data or settings packet dropping other. Packets bigger than
+            # buffer have result length > _VAC248IP_CAMERA_DATA_PACKET_SIZE
+            result_length = camera_socket.recv_into(packet_buffer, data_packet_size, _RECV_FLAGS)
 
-            # Check packet source and type (by size)
+            # Check packet type (by size)
             if result_length == data_packet_size:
-                if address[0] != camera_address:
-                    continue
-
                 # Data packet received:
                 # [frame number (bytes: 0) | pix number (bytes: 1 hi, 2, 3 low) |
                 # pixel data (bytes: [4...1472))]
 
-                # Marked type == 0 by default
                 incorrect_length_packets = 0
 
                 # Frame numbers starts with 0
@@ -283,12 +372,17 @@ class Vac248IpCamera(Vac248IpCameraBase):
                 if frame_number > frames:
                     # All required frames received, stop packets collecting algorithm
                     break
-            elif result_length == config_packet_size:
-                if address[0] != camera_address:
-                    continue
 
+                packet_index, remainder = divmod(packet_buffer[1] << 16 | packet_buffer[2] << 8 | packet_buffer[3],
+                                                 default_frame_data_size)
+                if not remainder and packet_index < frame_packets:
+                    seen_index = (frame_number - 1) * frame_packets + packet_index
+                    if not packets_seen[seen_index]:
+                        packets_seen[seen_index] = 1
+                        unique_packets_received += 1
+            elif result_length == config_packet_size:
                 # Config packet received
-                packet_buffers_mv[packet_offset] = 1
+                types_mv[packets_received] = 1
                 incorrect_length_packets = 0
             else:
                 incorrect_length_packets += 1
@@ -296,6 +390,9 @@ class Vac248IpCamera(Vac248IpCameraBase):
                     break
                 continue
             packets_received += 1
+            if unique_packets_received == unique_packets_required:
+                # All packets of required frames received, next frame is not awaited
+                break
 
         # Stop video stream
         self._send_command_stop()
@@ -303,26 +400,42 @@ class Vac248IpCamera(Vac248IpCameraBase):
         self._drop_received_packets()
 
         self.logger.debug("Received %s packet(s).", packets_received)
-        return packet_buffers_mv[:packets_received * (data_packet_size + 1)], packets_received
+        return types[:packets_received], payloads[:packets_received], packets_received
 
     def _drop_received_packets(self) -> None:
         time.sleep(self.drop_packets_delay)
-        packet_buffer = np.empty(_VAC248IP_CAMERA_DATA_PACKET_SIZE, dtype=np.uint8)
-        packet_length = packet_buffer.shape[0]
+        packet_buffer = self._drop_buffer
+        # Socket is switched to non-blocking mode, because with timeout even
+        # MSG_DONTWAIT waits for the whole timeout when there are no packets
         try:
             self._socket.setblocking(False)
+            recv_into = self._socket.recv_into
             while True:
-                self._socket.recvfrom_into(packet_buffer, packet_length)
+                recv_into(packet_buffer)
         except BlockingIOError:
             pass
         finally:
             self._set_socket_blocking_with_timeout(self._network_operation_timeout)
 
+    def _get_packet_buffers(self, packets_count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns buffers for types and data of given number of packets. Buffers are
+        allocated again only if they are too small.
+        :param packets_count: number of packets.
+        :return: (buffer for types of packets, buffer for data of packets).
+        """
+
+        if self._packet_types.shape[0] < packets_count:
+            self._packet_payloads = np.empty((packets_count, _VAC248IP_CAMERA_DATA_PACKET_SIZE), dtype=np.uint8)
+            self._packet_types = np.empty(packets_count, dtype=np.uint8)
+        return self._packet_types[:packets_count], self._packet_payloads[:packets_count]
+
     def _load_capture_packets_native_fn(self, native_library) -> None:
         self._capture_packets_native_fn = native_library.pyvac248ipnative_capture_packets
         self._capture_packets_native_fn.restype = ctypes.c_int
         self._capture_packets_native_fn.argtypes = (
-            ctypes.c_void_p,  # dst
+            ctypes.c_void_p,  # dst_types
+            ctypes.c_void_p,  # dst_payloads
             ctypes.c_int,  # dst_size
             ctypes.POINTER(ctypes.c_int),  # packets_received
             ctypes.c_int,  # socket_fd
@@ -342,12 +455,16 @@ class Vac248IpCamera(Vac248IpCameraBase):
     def _open(self) -> None:
         self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
         try:
+            # Adjust receive socket buffer size, so that bursts of packets of big frames
+            # are not dropped
+            if self._receive_buffer_size is not None:
+                self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self._receive_buffer_size)
+                self.logger.debug("Socket receive buffer size: %s bytes.",
+                                  self._socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF))
             self._socket.bind(("", self._camera_port))
             if self._network_operation_timeout is not None:
                 self._socket.settimeout(self._network_operation_timeout)
             self._socket.connect((self._camera_host, self._camera_port))
-            # Adjust receive socket buffer size
-            # self.__socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8192 * (64 + 5))
 
             # Try to stop camera, if it was opened before
             self._send_command_stop()
@@ -360,13 +477,17 @@ class Vac248IpCamera(Vac248IpCameraBase):
 
     def _send_command(self, command: int, data: int = 0) -> None:
         """
-        Sends command.
+        Sends command. Commands are sent at least send_command_delay seconds apart,
+        waiting is done only if previous command was sent less than this time ago.
         :param command: command code;
         :param data: data for command.
         """
 
-        self._socket.send(bytes((command & 0xff, data & 0xff, 0, 0, 0, 0, 0, (command + data) & 0xff)))
-        time.sleep(self.send_command_delay)
+        delay = self._next_command_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self._socket.send(_get_command_packet(command, data))
+        self._next_command_time = time.monotonic() + self.send_command_delay
 
     def _set_socket_blocking_with_timeout(self, timeout: Union[None, int, float]) -> None:
         self._socket.setblocking(True)
@@ -383,7 +504,14 @@ class Vac248IpCamera(Vac248IpCameraBase):
             return False
 
         native_library = ctypes.CDLL(native_library_name, mode=ctypes.RTLD_LOCAL)
-        # TODO: Check native library version.
+        # Library of other major version has other arguments of capture function
+        major = ctypes.c_int(0)
+        get_version_fn = native_library.pyvac248ipnative_get_version
+        get_version_fn.restype = ctypes.c_int
+        get_version_fn.argtypes = (ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+                                   ctypes.POINTER(ctypes.c_int))
+        if get_version_fn(ctypes.byref(major), None, None) != 0 or major.value != _NATIVE_LIBRARY_VERSION_MAJOR:
+            return False
         self._load_capture_packets_native_fn(native_library)
         return True
 
@@ -396,48 +524,22 @@ class Vac248IpCamera(Vac248IpCameraBase):
         :param num_frames: frames from camera used to glue result frame.
         """
 
-        frame_width, frame_height, frame_packets, bytes_per_pixel = \
-            vac248ip_frame_parameters_by_format[self._video_format]
-        frame_size = frame_width * frame_height * bytes_per_pixel
-
-        default_frame_data_size = _VAC248IP_CAMERA_DATA_PACKET_SIZE - 4
-        max_offset = default_frame_data_size * (frame_packets - 1)
+        frame_packets, frame_size, buffer_packets = _vac248ip_frame_layout_by_format[self._video_format]
+        default_frame_data_size = _VAC248IP_CAMERA_FRAME_DATA_SIZE
 
         # Capture frames from video stream
-        packet_buffers, packets_received = self._capture_packets(frames=num_frames)
+        types, payloads, _ = self._capture_packets(frames=num_frames)
+        config_data, rows, _, packet_indices = _parse_packets(types, payloads, frame_packets)
 
-        config_packet_index = None
+        # Glue packets into frame, the last received copy of packet is used
+        frame_buffers = np.zeros((buffer_packets, default_frame_data_size), dtype=np.uint8)
+        last = _get_last_occurrences(packet_indices)
+        frame_buffers[packet_indices[last]] = payloads[rows[last], 4:]
+        self._frame_buffer = frame_buffers.reshape(-1)[:frame_size]
 
-        # Build frames using data packets
-        frame_buffer = self._frame_buffer = np.zeros(frame_size, dtype=np.uint8)
-
-        for packet_index in range(packets_received):
-            packet_buffer_offset = packet_index * (_VAC248IP_CAMERA_DATA_PACKET_SIZE + 1)
-            if packet_buffers[packet_buffer_offset] == 1:
-                # Settings packet
-                config_packet_index = packet_index
-                continue
-
-            packet_buffer = packet_buffers[packet_buffer_offset + 1:
-                                           packet_buffer_offset + 1 + _VAC248IP_CAMERA_DATA_PACKET_SIZE]
-
-            # Packet: [frame number (bytes: 0) | pix number (bytes: 1 hi, 2, 3 low) |
-            # pixel data (bytes: [4...1472))]
-            offset = packet_buffer[1] << 16 | packet_buffer[2] << 8 | packet_buffer[3]
-
-            # Filter incorrect offsets
-            if offset > max_offset or offset % default_frame_data_size != 0:
-                continue
-
-            # Glue packet into frame
-            actual_packet_size = min(default_frame_data_size, frame_size - offset)
-            frame_buffer[offset:offset + actual_packet_size] = packet_buffer[4:actual_packet_size + 4]
-
-        if config_packet_index is not None:
+        if config_data is not None:
             try:
-                packet_buffer_offset = config_packet_index * (_VAC248IP_CAMERA_DATA_PACKET_SIZE + 1)
-                self._apply_config(packet_buffers[packet_buffer_offset + 1:
-                                                  packet_buffer_offset + 1 + _Vac248IpCameraConfig.PACKET_LENGTH])
+                self._apply_config(config_data)
             except Exception:
                 pass
 
@@ -457,54 +559,29 @@ class Vac248IpCamera(Vac248IpCameraBase):
         :param num_frames: frames from camera used to glue each sub-frame.
         """
 
-        frame_width, frame_height, frame_packets, bytes_per_pixel = \
-            vac248ip_frame_parameters_by_format[self._video_format]
-        frame_size = frame_width * frame_height * bytes_per_pixel
-
-        default_frame_data_size = _VAC248IP_CAMERA_DATA_PACKET_SIZE - 4
-        max_offset = default_frame_data_size * (frame_packets - 1)
+        frame_packets, frame_size, buffer_packets = _vac248ip_frame_layout_by_format[self._video_format]
+        default_frame_data_size = _VAC248IP_CAMERA_FRAME_DATA_SIZE
 
         # Capture frames from video stream
-        packet_buffers, packets_received = self._capture_packets(frames=frames * num_frames)
-
-        config_packet_index = None
-
-        # Build frames using data packets
-        frame_buffers = np.zeros((frames, frame_size), dtype=np.uint8)
-
-        for packet_index in range(packets_received):
-            packet_buffer_offset = packet_index * (_VAC248IP_CAMERA_DATA_PACKET_SIZE + 1)
-            if packet_buffers[packet_buffer_offset] == 1:
-                # Settings packet
-                config_packet_index = packet_index
-                continue
-
-            packet_buffer = packet_buffers[packet_buffer_offset + 1:
-                                           packet_buffer_offset + 1 + _VAC248IP_CAMERA_DATA_PACKET_SIZE]
-
-            # Packet: [frame number (bytes: 0) | pix number (bytes: 1 hi, 2, 3 low) |
-            # pixel data (bytes: [4...1472))]
-            # Fix frame_number for skipped overexposed frame (1st frame)
-            frame_number = packet_buffer[0] - 1
-            offset = packet_buffer[1] << 16 | packet_buffer[2] << 8 | packet_buffer[3]
-
-            # Filter incorrect offsets
-            if offset > max_offset or offset % default_frame_data_size != 0:
-                continue
-
-            # Glue packet into frame
-            actual_packet_size = min(default_frame_data_size, frame_size - offset)
-            frame_buffers[frame_number // frames, offset:offset + actual_packet_size] \
-                = packet_buffer[4:actual_packet_size + 4]
-
-        self._frame_buffer = frame_buffers.mean(axis=0, dtype=np.uint16).astype(np.uint8)
-
-        if config_packet_index is not None:
+        types, payloads, _ = self._capture_packets(frames=frames * num_frames)
+        config_data, rows, frame_numbers, packet_indices = _parse_packets(types, payloads, frame_packets)
+
+        # Glue packets into frames, the last received copy of packet is used.
+        # Fix frame_number for skipped overexposed frame (1st frame)
+        frame_indices = (frame_numbers - 1) // frames
+        frame_buffers = np.zeros((frames, buffer_packets, default_frame_data_size), dtype=np.uint8)
+        last = _get_last_occurrences(frame_indices * buffer_packets + packet_indices)
+        frame_buffers[frame_indices[last], packet_indices[last]] = payloads[rows[last], 4:]
+        frame_buffers = frame_buffers.reshape(frames, -1)[:, :frame_size]
+
+        # Integer mean: sum in uint16 accumulator and divide it in place
+        mean_frame = np.add.reduce(frame_buffers, axis=0, dtype=np.uint16)
+        np.floor_divide(mean_frame, frames, out=mean_frame)
+        self._frame_buffer = mean_frame.astype(np.uint8)
+
+        if config_data is not None:
             try:
-                packet_buffer_offset = config_packet_index * (_VAC248IP_CAMERA_DATA_PACKET_SIZE + 1)
-                self._apply_config(
-                    packet_buffers[packet_buffer_offset + 1:
-                                   packet_buffer_offset + 1 + _Vac248IpCameraConfig.PACKET_LENGTH])
+                self._apply_config(config_data)
             except Exception:
                 pass
 
@@ -517,71 +594,36 @@ class Vac248IpCamera(Vac248IpCameraBase):
         :param frames: frames from camera used to calculate mean frame.
         """
 
-        frame_width, frame_height, frame_packets, bytes_per_pixel = \
-            vac248ip_frame_parameters_by_format[self._video_format]
-        frame_size = frame_width * frame_height * bytes_per_pixel
-
-        default_frame_data_size = _VAC248IP_CAMERA_DATA_PACKET_SIZE - 4
-        max_offset = default_frame_data_size * (frame_packets - 1)
+        frame_packets, frame_size, buffer_packets = _vac248ip_frame_layout_by_format[self._video_format]
+        default_frame_data_size = _VAC248IP_CAMERA_FRAME_DATA_SIZE
 
         # Capture frames from video stream
-        packet_buffers, packets_received = self._capture_packets(frames=frames)
-
-        config_packet_index = None
-
-        # Build frames using data packets
-        frame_buffers = np.zeros((frames, frame_size), dtype=np.uint8)
-
-        # Received packets map by frame
-        frame_packets_received = np.zeros((frames, frame_packets), dtype=np.bool_)
-
-        for packet_index in range(packets_received):
-            packet_buffer_offset = packet_index * (_VAC248IP_CAMERA_DATA_PACKET_SIZE + 1)
-            if packet_buffers[packet_buffer_offset] == 1:
-                # Settings packet
-                config_packet_index = packet_index
-                continue
-
-            packet_buffer = packet_buffers[packet_buffer_offset + 1:
-                                           packet_buffer_offset + 1 + _VAC248IP_CAMERA_DATA_PACKET_SIZE]
-
-            # Packet: [frame number (bytes: 0) | pix number (bytes: 1 hi, 2, 3 low) |
-            # pixel data (bytes: [4...1472))]
-            # Fix frame_number for skipped overexposed frame (1st frame)
-            frame_number = packet_buffer[0] - 1
-            offset = packet_buffer[1] << 16 | packet_buffer[2] << 8 | packet_buffer[3]
-
-            # Filter incorrect offsets
-            if offset > max_offset or offset % default_frame_data_size != 0:
-                continue
-
-            # Glue packet into current frame
-            actual_packet_size = min(default_frame_data_size, frame_size - offset)
-            frame_buffers[frame_number, offset:offset + actual_packet_size] = packet_buffer[4:actual_packet_size + 4]
-
-            frame_packets_received[frame_number, offset // default_frame_data_size] = True
-
-        received_packets_counts = np.zeros(frame_packets, dtype=np.int_)
-
-        frame_buffer = self._frame_buffer = np.empty(frame_size, dtype=np.uint8)
-        for packet_index in range(frame_packets):
-            offset = packet_index * default_frame_data_size
-            actual_packet_size = min(default_frame_data_size, frame_size - offset)
-
-            received_packets = frame_buffers[np.nonzero(frame_packets_received.transpose()[packet_index]),
-                                             offset:offset + actual_packet_size]
-            if received_packets.shape[1] > 0:
-                frame_buffer[offset:offset + actual_packet_size] = received_packets.mean(axis=1, dtype=np.uint16)
-            else:
-                frame_buffer[offset:offset + actual_packet_size] = 0
-
-            received_packets_counts[packet_index] = received_packets.shape[1]
-
-        if config_packet_index is not None:
+        types, payloads, _ = self._capture_packets(frames=frames)
+        config_data, rows, frame_numbers, packet_indices = _parse_packets(types, payloads, frame_packets)
+
+        # Glue packets into frames, the last received copy of packet is used.
+        # Fix frame_number for skipped overexposed frame (1st frame)
+        frame_indices = frame_numbers - 1
+        frame_buffers = np.zeros((frames, buffer_packets, default_frame_data_size), dtype=np.uint8)
+        last = _get_last_occurrences(frame_indices * buffer_packets + packet_indices)
+        frame_buffers[frame_indices[last], packet_indices[last]] = payloads[rows[last], 4:]
+
+        # Number of frames in which every packet was received, unique packets are counted
+        received_packets_counts = np.bincount(packet_indices[last], minlength=frame_packets)
+
+        # Every packet of result frame is mean of this packet in frames where it was
+        # received. Packets that were not received are zeros in frame buffers, so
+        # packets not received at all stay zero when divided by 1
+        packets_means = np.add.reduce(frame_buffers[:, :frame_packets], axis=0, dtype=np.uint16)
+        divisors = np.maximum(received_packets_counts, 1).astype(np.uint16)
+        np.floor_divide(packets_means, divisors[:, None], out=packets_means)
+        frame_buffer = np.zeros((buffer_packets, default_frame_data_size), dtype=np.uint8)
+        frame_buffer[:frame_packets] = packets_means
+        self._frame_buffer = frame_buffer.reshape(-1)[:frame_size]
+
+        if config_data is not None:
             try:
-                packet_buffer_offset = config_packet_index * (_VAC248IP_CAMERA_DATA_PACKET_SIZE + 1)
-                self._apply_config(packet_buffers[packet_buffer_offset + 1:
-                                                  packet_buffer_offset + 1 + _Vac248IpCameraConfig.PACKET_LENGTH])
+                self._apply_config(config_data)
             except Exception:
                 pass
 
@@ -626,6 +668,7 @@ class Vac248IpCamera(Vac248IpCameraBase):
                 self._socket.close()
                 self._socket = None
             self._frame_number = 0
+            self._last_config_data = b""
 
     @property
     def is_open(self) -> bool:
@@ -695,14 +738,26 @@ class _Vac248IpCameraConfig:
 
     PACKET_LENGTH = len(FIELDS)
 
+    # Only unpacked packet, composite fields and values decoded from them are stored,
+    # other fields are read from unpacked packet by properties
+    __slots__ = ("_values", "auto_gain_expo", "gamma_correction", "mac_address", "management_data", "packet_count",
+                 "shutter", "video_port")
+
     def __init__(self, buffer: Union[ByteString, np.ndarray, memoryview]):
         if len(buffer) != _Vac248IpCameraConfig.PACKET_LENGTH:
             raise ValueError("Incorrect buffer length (required: {}, but given: {})".format(
                 _Vac248IpCameraConfig.PACKET_LENGTH, len(buffer)))
 
-        # Unpack fields
-        for field, value in zip(_Vac248IpCameraConfig.FIELDS, buffer):
-            setattr(self, field, value)
+        # Unpack fields, they are available as properties with names from FIELDS
+        self._values: Tuple[int, ...] = _CONFIG_STRUCT.unpack(buffer)
+        # Composite little-endian fields
+        self.packet_count, self.video_port, self.management_data = _CONFIG_COMPOSITE_STRUCT.unpack(buffer)
+        # Fields mac_0...mac_5
+        self.mac_address: bytes = bytes(self._values[12:18])
+        # Bits of management data
+        self.gamma_correction: Vac248IpGamma = _GAMMA_BY_BITS[(self.management_data >> 18) & 0x3]
+        self.shutter: Vac248IpShutter = _SHUTTER_BY_BIT[(self.management_data >> 29) & 0x1]
+        self.auto_gain_expo: bool = (self.management_data & 0x10000000) == 0
 
         if self.check_0 != _Vac248IpCameraConfig.CHECK_0 or self.check_1 != _Vac248IpCameraConfig.CHECK_1:
             raise ValueError("Incorrect check bytes")
@@ -716,52 +771,39 @@ class _Vac248IpCameraConfig:
         Packs current object fields to ready-to-send buffer.
         """
 
-        return bytes(getattr(self, field) for field in _Vac248IpCameraConfig.FIELDS)
-
-    @property
-    def video_port(self) -> int:
-        return self.video_port_0 + (self.video_port_1 << 8)
+        return _CONFIG_STRUCT.pack(*self._values)
 
     @property
     def video_format(self) -> Vac248IpVideoFormat:
         return Vac248IpVideoFormat(self.video_mode)
 
-    @property
-    def packet_count(self) -> int:
-        return self.packet_count_0 + (self.packet_count_1 << 8)
 
-    @property
-    def management_data(self) -> int:
-        return self.management_data_0 + (self.management_data_1 << 8) + (self.management_data_2 << 16) + \
-            (self.management_data_3 << 24)
-
-    @property
-    def gamma_correction(self) -> Vac248IpGamma:
-        d = self.management_data
-        if (d & 0x00080000) != 0:
-            return Vac248IpGamma.GAMMA_1
-        if (d & 0x00040000) != 0:
-            return Vac248IpGamma.GAMMA_07
-        return Vac248IpGamma.GAMMA_045
+def _create_config_field(index: int) -> property:
+    """
+    Function creates property to read field of config packet.
+    :param index: index of field in packet.
+    :return: property.
+    """
 
-    @property
-    def shutter(self) -> Vac248IpShutter:
-        if (self.management_data & 0x20000000) != 0:
-            return Vac248IpShutter.SHUTTER_GLOBAL
-        return Vac248IpShutter.SHUTTER_ROLLING
+    return property(lambda self: self._values[index])
 
-    @property
-    def auto_gain_expo(self) -> bool:
-        return (self.management_data & 0x10000000) == 0
 
-    @property
-    def mac_address(self) -> bytes:
-        return bytes((self.mac_0, self.mac_1, self.mac_2, self.mac_3, self.mac_4, self.mac_5))
+_CONFIG_STRUCT = struct.Struct("{}B".format(_Vac248IpCameraConfig.PACKET_LENGTH))
+# packet_count (bytes 1, 2), video_port (bytes 18, 19), management_data (bytes 40...43)
+_CONFIG_COMPOSITE_STRUCT = struct.Struct("<xH15xH20xI4x")
+# Gamma by bits 19, 18 of management data: bit 19 means 1, bit 18 means 0.7, no bits mean 0.45
+_GAMMA_BY_BITS = (Vac248IpGamma.GAMMA_045, Vac248IpGamma.GAMMA_07, Vac248IpGamma.GAMMA_1, Vac248IpGamma.GAMMA_1)
+# Shutter by bit 29 of management data
+_SHUTTER_BY_BIT = (Vac248IpShutter.SHUTTER_ROLLING, Vac248IpShutter.SHUTTER_GLOBAL)
+for _index, _field in enumerate(_Vac248IpCameraConfig.FIELDS):
+    setattr(_Vac248IpCameraConfig, _field, _create_config_field(_index))
 
 
 class _Vac251IpCameraConfig(_Vac248IpCameraConfig):
     CAMERA_ID = 0xa
 
+    __slots__ = ()
+
 
 class Cameras:
     def __init__(self, addresses: List[str], video_format: Vac248IpVideoFormat = Vac248IpVideoFormat.FORMAT_960x600,
@@ -792,13 +834,16 @@ class Cameras:
                            allow_native_library=self.__allow_native_library)
             for address in self.__addresses
         ]
-        opened_cameras = []
+        # Cameras are opened in parallel, opening is mostly waiting for network
         try:
-            for camera in self.__cameras:
-                camera.open_device(attempts=self.__open_attempts)
-                opened_cameras.append(camera)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(self.__cameras) or 1) as executor:
+                futures = [executor.submit(camera.open_device, attempts=self.__open_attempts)
+                           for camera in self.__cameras]
+                for future in futures:
+                    future.result()
         except BaseException:
-            for camera in opened_cameras:
+            # Executor has waited for all cameras, close_device() does nothing for not opened ones
+            for camera in self.__cameras:
                 camera.close_device()
             self.__cameras = None
             raise
@@ -853,6 +898,12 @@ def vac248ip_main(args: List[str]) -> int:
         print("Incorrect mode: '{}', expected one of: 'simple' (default), 'mean', 'smart'".format(parsed_args.mode),
               file=sys.stderr)
         return 1
+
+    def get_bitmap_with_time(cam: Vac248IpCamera) -> Tuple[bytes, int, float]:
+        start_time = time.monotonic()
+        bitmap, frame_number = get_bitmap_fn(cam)
+        return bitmap, frame_number, time.monotonic() - start_time
+
     if parsed_args.debug:
         line_1_end = "\n"
         line_2_prefix = " => "
@@ -870,20 +921,21 @@ def vac248ip_main(args: List[str]) -> int:
                 print("Native library not used.")
             break
         count = parsed_args.count
-        for attempt_number in range(count):
-            for camera_number, camera in enumerate(cameras):
-                print("Attempt #{:0>3d}, camera #{:0>3d}...".format(attempt_number, camera_number), end=line_1_end,
-                      flush=True)
-                start_time = time.monotonic()
-                bitmap, frame_number = get_bitmap_fn(camera)
-                frame_get_time = time.monotonic() - start_time
-
-                bitmap_name = "bitmap_m{}_a{:0>3d}_c{:0>3d}_f{:0>3d}.{}".format(mode, attempt_number, camera_number,
-                                                                                frame_number, image_format)
-                print("{}Got frame #{:0>3d}, {:.6f} s. File: {}".format(line_2_prefix, frame_number, frame_get_time,
-                                                                        bitmap_name), flush=True)
-                with open(bitmap_name, "wb") as file:
-                    file.write(bitmap)
+        # Frames from all cameras are received in parallel, results are shown in order of cameras
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(cameras) or 1) as executor:
+            for attempt_number in range(count):
+                futures = [executor.submit(get_bitmap_with_time, camera) for camera in cameras]
+                for camera_number, future in enumerate(futures):
+                    print("Attempt #{:0>3d}, camera #{:0>3d}...".format(attempt_number, camera_number),
+                          end=line_1_end, flush=True)
+                    bitmap, frame_number, frame_get_time = future.result()
+
+                    bitmap_name = "bitmap_m{}_a{:0>3d}_c{:0>3d}_f{:0>3d}.{}".format(
+                        mode, attempt_number, camera_number, frame_number, image_format)
+                    print("{}Got frame #{:0>3d}, {:.6f} s. File: {}".format(line_2_prefix, frame_number,
+                                                                            frame_get_time, bitmap_name), flush=True)
+                    with open(bitmap_name, "wb") as file:
+                        file.write(bitmap)
     return 0
 
 